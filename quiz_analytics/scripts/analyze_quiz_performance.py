@@ -6,19 +6,42 @@ Usage:
     python analyze_quiz_performance.py spring2026_001
     python analyze_quiz_performance.py spring2026_001 --full
     python analyze_quiz_performance.py --all
+    python analyze_quiz_performance.py --all --jobs 4
+    python analyze_quiz_performance.py spring2026_001 --bootstrap
+    python analyze_quiz_performance.py --all --irt
+    python analyze_quiz_performance.py --all --stream
+    python analyze_quiz_performance.py --all --dif
+    python analyze_quiz_performance.py spring2026_001 --exclude-rapid-guessers
+    python analyze_quiz_performance.py spring2026_001 --attempts best
 """
 
 import os
+import re
 import sys
+import copy
+import html
 import json
 import math
+import hashlib
 import argparse
+import warnings
 from datetime import datetime
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from collections import defaultdict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from json_stream import QuizStreamWriter, iter_streamed_quizzes
+from response_store import OTHER_ANSWER_ID, load_response_store, open_response_store
+
 
 def load_config():
     """Load configuration from config.json (or config.yaml if available)."""
@@ -43,8 +66,8 @@ def load_config():
     raise FileNotFoundError("No config.json or config.yaml found")
 
 
-def load_quiz_data(section_key, config):
-    """Load all quiz data for a section."""
+def section_data_dir(section_key, config):
+    """Raw data directory for a section (exits if it has not been fetched)."""
     data_dir = Path(__file__).parent.parent / config["paths"]["raw_data"] / section_key
 
     if not data_dir.exists():
@@ -52,6 +75,18 @@ def load_quiz_data(section_key, config):
         print(f"Run fetch_canvas_data.py first.")
         sys.exit(1)
 
+    return data_dir
+
+
+def load_quiz_data(section_key, config):
+    """Load all quiz data for a section."""
+    data_dir = section_data_dir(section_key, config)
+
+    # Prefer the columnar response store written by fetch_canvas_data.py
+    stored = load_response_store(data_dir)
+    if stored is not None:
+        return stored
+
     all_quizzes_file = data_dir / "all_quizzes.json"
     if all_quizzes_file.exists():
         with open(all_quizzes_file) as f:
@@ -66,6 +101,32 @@ def load_quiz_data(section_key, config):
     return {"quizzes": quizzes, "section": section_key}
 
 
+def iter_quiz_data(section_key, config):
+    """
+    Yield a section's quizzes one at a time, for streaming analysis.
+
+    Reads the same source as load_quiz_data, in the same order: the
+    response store (built one by one from its memory-mapped columns),
+    all_quizzes.json (parsed one quiz at a time) or the quiz_*.json files,
+    so only one quiz is held in memory.
+    """
+    data_dir = section_data_dir(section_key, config)
+
+    opened = open_response_store(data_dir)
+    if opened is not None:
+        yield from opened[1]
+        return
+
+    all_quizzes_file = data_dir / "all_quizzes.json"
+    if all_quizzes_file.exists():
+        yield from iter_streamed_quizzes(all_quizzes_file)
+        return
+
+    for quiz_file in sorted(data_dir.glob("quiz_*.json")):
+        with open(quiz_file) as f:
+            yield json.load(f)
+
+
 def load_grades_data(section_key, config):
     """Load grades data for correlation analysis."""
     data_dir = Path(__file__).parent.parent / config["paths"]["raw_data"] / section_key
@@ -74,95 +135,522 @@ def load_grades_data(section_key, config):
     if grades_file.exists():
         with open(grades_file) as f:
             data = json.load(f)
-            # Build lookup by student_id
-            return {e["student_id"]: e for e in data.get("enrollments", [])}
+            return GradeTable(data.get("enrollments", []))
+
+    return GradeTable()
 
-    return {}
 
+def normalize_text(text):
+    """Lowercase text with HTML tags, entities and extra whitespace removed."""
+    text = html.unescape(re.sub(r"<[^>]+>", " ", text or ""))
+    return " ".join(text.split()).lower()
 
-def calculate_difficulty(responses, question_id):
+
+def question_fingerprint(question):
+    """Identify a question across quizzes, sections and terms by its text and answers."""
+    parts = [normalize_text(question.get("text", ""))]
+    parts += sorted(normalize_text(a.get("text", "")) for a in question.get("answers", []))
+    return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()[:16]
+
+
+class GradeTable:
     """
-    Calculate item difficulty (p-value).
-    p = proportion of students who answered correctly
+    Final grades for a section, resolved once per student.
+
+    Grades are kept in a dense array, one slot per student, with a mask of
+    which students have a grade. A student's grade is their final_score,
+    or current_score when there is no final score; a final score of 0 is
+    a grade like any other.
+    """
+
+    def __init__(self, enrollments=()):
+        self.index = {}
+        grade = array("d")
+        graded = array("b")
+
+        for enrollment in enrollments:
+            score = enrollment.get("final_score")
+            if score is None:
+                score = enrollment.get("current_score")
+            slot = self.index.setdefault(enrollment["student_id"], len(self.index))
+            if slot == len(grade):
+                grade.append(0.0)
+                graded.append(0)
+            grade[slot] = 0.0 if score is None else score
+            graded[slot] = score is not None
+
+        if np is not None:
+            self.grade = np.frombuffer(grade, dtype=np.float64)
+            self.graded = np.frombuffer(graded, dtype=np.int8).astype(bool)
+        else:
+            self.grade = grade
+            self.graded = graded
+
+    def __len__(self):
+        return len(self.index)
+
+    def get(self, student_id):
+        """A student's grade, or None."""
+        slot = self.index.get(student_id)
+        if slot is None or not self.graded[slot]:
+            return None
+        return float(self.grade[slot])
+
+    def lookup(self, student_ids):
+        """Grades and has-grade mask for a sequence of students, in order."""
+        slots = [self.index.get(sid, -1) for sid in student_ids]
+
+        if np is not None:
+            slots = np.array(slots, dtype=np.int64)
+            grade = np.zeros(len(slots))
+            graded = np.zeros(len(slots), dtype=bool)
+            known = slots >= 0
+            graded[known] = self.graded[slots[known]]
+            grade[graded] = self.grade[slots[graded]]
+            return grade, graded
+
+        grade = array("d", bytes(8 * len(slots)))
+        graded = array("b", bytes(len(slots)))
+        for row, slot in enumerate(slots):
+            if slot >= 0 and self.graded[slot]:
+                grade[row] = self.grade[slot]
+                graded[row] = 1
+        return grade, graded
+
+
+class ResponseMatrix:
+    """
+    Student x item response data for one quiz, built in a single pass.
+
+    Cells are stored row-major in flat arrays (one row per submission, one
+    column per question): whether the question was answered, whether it was
+    correct, and which answer option was chosen. When NumPy is installed the
+    same buffers are viewed as 2-D arrays and item statistics are computed
+    for all questions at once; otherwise they are computed with plain loops.
+
+    Responses come from each submission's "responses" dict, or from the
+    response store's columns when question_keys and columns are given.
+    Each row's final grade is read from the section's GradeTable, and its
+    completion time (NaN if unknown) from the submission's time_spent.
     """
-    correct = 0
-    total = 0
 
-    for resp in responses:
-        q_resp = resp.get("responses", {}).get(str(question_id))
-        if q_resp is not None:
-            total += 1
-            if q_resp.get("correct", False):
-                correct += 1
+    NO_ANSWER = -1     # response without an answer_id
+    OTHER_ANSWER = -2  # answer_id that is not one of the question's options
 
-    if total == 0:
-        return None
+    def __init__(self, submissions, questions, grades=None, question_keys=None, columns=None):
+        self.n_rows = len(submissions)
+        self.n_items = len(questions)
+        self.options = [
+            list(dict.fromkeys(a["id"] for a in q.get("answers", []))) for q in questions
+        ]
 
-    return correct / total
+        size = self.n_rows * self.n_items
+        answered = array("b", bytes(size))
+        correct = array("b", bytes(size))
+        choice = array("h", [self.NO_ANSWER]) * size
 
+        keys = [str(q["id"]) for q in questions]
+        option_index = [{ans_id: i for i, ans_id in enumerate(opts)} for opts in self.options]
 
-def calculate_discrimination(responses, question_id, grades, method="top_bottom_27"):
+        self.grade, self.graded = (grades or GradeTable()).lookup(
+            [sub["student_id"] for sub in submissions]
+        )
+        time_spent = array("d", [
+            t if isinstance(t, (int, float)) and not isinstance(t, bool) and t >= 0 else math.nan
+            for t in (sub.get("time_spent") for sub in submissions)
+        ])
+
+        if columns is not None:
+            self._fill_from_columns(question_keys, columns, keys, option_index,
+                                    answered, correct, choice)
+        else:
+            for row, sub in enumerate(submissions):
+                responses = sub.get("responses", {})
+                base = row * self.n_items
+                for col, key in enumerate(keys):
+                    q_resp = responses.get(key)
+                    if q_resp is None:
+                        continue
+                    cell = base + col
+                    answered[cell] = 1
+                    if q_resp.get("correct", False):
+                        correct[cell] = 1
+                    answer_id = q_resp.get("answer_id")
+                    if answer_id:
+                        choice[cell] = option_index[col].get(answer_id, self.OTHER_ANSWER)
+
+        if np is not None:
+            shape = (self.n_rows, self.n_items)
+            self.answered = np.frombuffer(answered, dtype=np.int8).reshape(shape).astype(bool)
+            self.correct = np.frombuffer(correct, dtype=np.int8).reshape(shape).astype(bool)
+            self.choice = np.frombuffer(choice, dtype=np.int16).reshape(shape)
+            self.time_spent = np.frombuffer(time_spent, dtype=np.float64)
+        else:
+            self.answered = answered
+            self.correct = correct
+            self.choice = choice
+            self.time_spent = time_spent
+
+        self._rank()
+
+    def _rank(self):
+        """
+        Graded rows by final grade, highest first; a stable sort keeps
+        submission order for ties, so each question's respondents appear
+        in the same order as if they had been sorted on their own.
+        """
+        if np is not None:
+            rows = np.flatnonzero(self.graded)
+            self.ranking = rows[np.argsort(-self.grade[rows], kind="stable")]
+        else:
+            self.ranking = [row for row in range(self.n_rows) if self.graded[row]]
+            self.ranking.sort(key=lambda row: self.grade[row], reverse=True)
+
+    def _fill_from_columns(self, question_keys, columns, keys, option_index,
+                           answered, correct, choice):
+        """Scatter response store rows into the flat answered/correct/choice cells."""
+        # Matrix columns for each stored question key (usually exactly one)
+        key_columns = [[] for _ in question_keys]
+        key_index = {key: i for i, key in enumerate(question_keys)}
+        for col, key in enumerate(keys):
+            if key in key_index:
+                key_columns[key_index[key]].append(col)
+
+        option_ids = [ans_id for index in option_index for ans_id in index]
+        if np is None or not all(isinstance(i, int) for i in option_ids):
+            for submission, question, answer_id, is_correct in zip(
+                    columns["submission"], columns["question"],
+                    columns["answer_id"], columns["correct"]):
+                for col in key_columns[question]:
+                    cell = submission * self.n_items + col
+                    answered[cell] = 1
+                    correct[cell] = is_correct
+                    if answer_id > 0:
+                        choice[cell] = option_index[col].get(answer_id, self.OTHER_ANSWER)
+                    elif answer_id == OTHER_ANSWER_ID:
+                        choice[cell] = self.OTHER_ANSWER
+            return
+
+        answered = np.frombuffer(answered, dtype=np.int8)
+        correct = np.frombuffer(correct, dtype=np.int8)
+        choice = np.frombuffer(choice, dtype=np.int16)
+        answer_ids = np.asarray(columns["answer_id"])
+
+        # Option lookup table: (matrix column, answer ID) -> option index,
+        # with answer IDs replaced by small codes so the pair fits one key
+        option_cols = np.array([col for col, index in enumerate(option_index) for _ in index],
+                               dtype=np.int64)
+        option_nums = np.array([i for index in option_index for i in index.values()],
+                               dtype=np.int16)
+        ids, codes = np.unique(np.concatenate((np.array(option_ids, dtype=np.int64), answer_ids)),
+                               return_inverse=True)
+        table_keys = option_cols * len(ids) + codes[:len(option_ids)]
+        order = np.argsort(table_keys)
+        table_keys, option_nums = table_keys[order], option_nums[order]
+        answer_codes = codes[len(option_ids):]
+
+        for rank in range(max(map(len, key_columns), default=0)):
+            col_of_key = np.array([cols[rank] if len(cols) > rank else -1 for cols in key_columns],
+                                  dtype=np.int64)
+            cols = col_of_key[np.asarray(columns["question"])]
+            keep = cols >= 0
+            cols = cols[keep]
+            cells = np.asarray(columns["submission"])[keep].astype(np.int64) * self.n_items + cols
+            answered[cells] = 1
+            correct[cells] = np.asarray(columns["correct"])[keep]
+
+            kept_ids = answer_ids[keep]
+            keys_wanted = cols * len(ids) + answer_codes[keep]
+            pos = np.minimum(np.searchsorted(table_keys, keys_wanted), max(len(table_keys) - 1, 0))
+            if len(table_keys):
+                found = table_keys[pos] == keys_wanted
+                matched = np.where(found, option_nums[pos], self.OTHER_ANSWER)
+            else:
+                matched = np.full(len(cells), self.OTHER_ANSWER, dtype=np.int16)
+            choice[cells] = np.where(
+                kept_ids > 0, matched,
+                np.where(kept_ids == OTHER_ANSWER_ID, self.OTHER_ANSWER, self.NO_ANSWER)
+            )
+
+    def select_rows(self, keep):
+        """A copy of the matrix with only the rows where keep (one bool per row) is true."""
+        subset = copy.copy(self)
+        rows = [row for row, kept in enumerate(keep) if kept]
+        subset.n_rows = len(rows)
+
+        if np is not None:
+            rows = np.array(rows, dtype=np.int64)
+            for name in ("answered", "correct", "choice", "grade", "graded", "time_spent"):
+                setattr(subset, name, getattr(self, name)[rows])
+        else:
+            for name in ("answered", "correct", "choice"):
+                cells = getattr(self, name)
+                setattr(subset, name, array(cells.typecode, (
+                    cells[row * self.n_items + col] for row in rows for col in range(self.n_items)
+                )))
+            for name in ("grade", "graded", "time_spent"):
+                values = getattr(self, name)
+                setattr(subset, name, array(values.typecode, (values[row] for row in rows)))
+
+        subset._rank()
+        return subset
+
+    def column(self, cells, col):
+        """Return one question's column from a flat fallback array."""
+        return cells[col::self.n_items]
+
+    def graded_rows(self, col):
+        """Rows that answered a question and have a final grade (fallback only)."""
+        answered = self.column(self.answered, col)
+        return [row for row in range(self.n_rows) if answered[row] and self.graded[row]]
+
+
+def calculate_difficulty(matrix):
     """
-    Calculate discrimination index using top/bottom 27% method.
-    D = p_upper - p_lower
+    Calculate item difficulty (p-value) for every question.
+    p = proportion of students who answered correctly
     """
-    # Get scores for students who answered this question
-    student_scores = []
-    for resp in responses:
-        student_id = resp["student_id"]
-        q_resp = resp.get("responses", {}).get(str(question_id))
-
-        if q_resp is not None and student_id in grades:
-            final_score = grades[student_id].get("final_score") or grades[student_id].get("current_score")
-            if final_score is not None:
-                student_scores.append({
-                    "student_id": student_id,
-                    "correct": q_resp.get("correct", False),
-                    "final_score": final_score
-                })
-
-    if len(student_scores) < 10:
-        return None  # Not enough data
-
-    # Sort by final score
-    student_scores.sort(key=lambda x: x["final_score"], reverse=True)
-
-    # Determine group sizes
-    n = len(student_scores)
+    if np is not None:
+        totals = matrix.answered.sum(axis=0).tolist()
+        corrects = matrix.correct.sum(axis=0).tolist()
+    else:
+        totals = [sum(matrix.column(matrix.answered, j)) for j in range(matrix.n_items)]
+        corrects = [sum(matrix.column(matrix.correct, j)) for j in range(matrix.n_items)]
+
+    return [c / t if t else None for c, t in zip(corrects, totals)]
+
+
+def group_size(n, method):
+    """Number of students in each of the upper and lower groups."""
     if method == "top_bottom_27":
-        group_size = max(1, int(n * 0.27))
+        return max(1, int(n * 0.27))
     elif method == "thirds":
-        group_size = n // 3
+        return n // 3
     else:  # median
-        group_size = n // 2
+        return n // 2
 
-    # Upper group (high performers)
-    upper_group = student_scores[:group_size]
-    upper_correct = sum(1 for s in upper_group if s["correct"])
-    p_upper = upper_correct / len(upper_group) if upper_group else 0
 
-    # Lower group (low performers)
-    lower_group = student_scores[-group_size:]
-    lower_correct = sum(1 for s in lower_group if s["correct"])
-    p_lower = lower_correct / len(lower_group) if lower_group else 0
+def group_sizes(n, method):
+    """group_size for a NumPy array of respondent counts."""
+    if method == "top_bottom_27":
+        return np.maximum(1, np.floor(n * 0.27))
+    elif method == "thirds":
+        return n // 3
+    else:  # median
+        return n // 2
 
-    return {
-        "D": p_upper - p_lower,
-        "p_upper": p_upper,
-        "p_lower": p_lower,
-        "upper_n": len(upper_group),
-        "lower_n": len(lower_group)
-    }
+
+def discrimination_groups(matrix, method):
+    """
+    Upper and lower groups for every question, from the quiz-wide ranking.
+
+    A question's groups are its first and last group_size respondents in
+    ranking order. With NumPy, returns (respondents, upper, lower) as
+    ranking x question boolean masks; otherwise lists of ranked rows per
+    question.
+    """
+    if np is not None:
+        respondents = matrix.answered[matrix.ranking]
+        position = np.cumsum(respondents, axis=0)  # 1-based rank among respondents
+        n = position[-1] if len(position) else np.zeros(matrix.n_items, dtype=np.int64)
+        size = group_sizes(n, method)
+        upper = respondents & (position <= size)
+        lower = respondents & (position > n - size)
+        return respondents, upper, lower
+
+    respondents, upper, lower = [], [], []
+    for j in range(matrix.n_items):
+        answered = matrix.column(matrix.answered, j)
+        ranked = [row for row in matrix.ranking if answered[row]]
+        size = group_size(len(ranked), method)
+        respondents.append(ranked)
+        upper.append(ranked[:size])
+        lower.append(ranked[-size:] if size else [])
+    return respondents, upper, lower
+
+
+def calculate_discrimination(matrix, method="top_bottom_27", groups=None):
+    """
+    Calculate discrimination index using top/bottom 27% method.
+    D = p_upper - p_lower
+    """
+    if groups is None:
+        groups = discrimination_groups(matrix, method)
+    respondents, upper, lower = groups
+
+    if np is not None:
+        correct = matrix.correct[matrix.ranking]
+        counts = respondents.sum(axis=0).tolist()
+        upper_n = upper.sum(axis=0).tolist()
+        lower_n = lower.sum(axis=0).tolist()
+        upper_correct = (upper & correct).sum(axis=0).tolist()
+        lower_correct = (lower & correct).sum(axis=0).tolist()
+    else:
+        counts = [len(rows) for rows in respondents]
+        upper_n = [len(rows) for rows in upper]
+        lower_n = [len(rows) for rows in lower]
+        upper_correct, lower_correct = [], []
+        for j in range(matrix.n_items):
+            correct = matrix.column(matrix.correct, j)
+            upper_correct.append(sum(correct[row] for row in upper[j]))
+            lower_correct.append(sum(correct[row] for row in lower[j]))
+
+    results = []
+    for j in range(matrix.n_items):
+        if counts[j] < 10:
+            results.append(None)  # Not enough data
+            continue
+
+        p_upper = upper_correct[j] / upper_n[j] if upper_n[j] else 0
+        p_lower = lower_correct[j] / lower_n[j] if lower_n[j] else 0
+
+        results.append({
+            "D": p_upper - p_lower,
+            "p_upper": p_upper,
+            "p_lower": p_lower,
+            "upper_n": upper_n[j],
+            "lower_n": lower_n[j]
+        })
+
+    return results
+
+
+def count_selections(matrix, groups):
+    """
+    Count responses and option selections per question, in one pass.
+
+    groups are the upper and lower groups from discrimination_groups.
+    Returns one dict per question: response and correct totals, each
+    option's selections overall and in the upper and lower groups, and
+    each option's selections and grade sum among graded respondents (with
+    those respondents' grade mean and spread) for option point-biserials.
+    """
+    respondents, upper, lower = groups
+    sizes = [len(opts) for opts in matrix.options]
+
+    if np is not None:
+        chosen = matrix.choice != ResponseMatrix.NO_ANSWER
+        totals = matrix.answered.sum(axis=0).tolist()
+        corrects = (matrix.correct & chosen).sum(axis=0).tolist()
+
+        # One bincount over all questions per tally, with each question's
+        # options offset so they get their own bins
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.int64)
+        n_bins = sum(sizes)
+        codes = matrix.choice.astype(np.int64) + offsets
+        has_option = matrix.choice >= 0
+        ranked_codes = codes[matrix.ranking]
+        ranked_option = has_option[matrix.ranking]
+        graded = matrix.answered & matrix.graded[:, None]
+        graded_option = graded & has_option
+        grade = np.broadcast_to(matrix.grade[:, None], codes.shape)
+
+        def tally(include, values=codes, weights=None):
+            flat = np.bincount(values[include], weights[include] if weights is not None else None,
+                               minlength=n_bins).tolist()
+            return [flat[o:o + size] for o, size in zip(offsets.tolist(), sizes)]
+
+        counts = tally(has_option)
+        upper_counts = tally(upper & ranked_option, ranked_codes)
+        lower_counts = tally(lower & ranked_option, ranked_codes)
+        graded_counts = tally(graded_option)
+        grade_sums = tally(graded_option, weights=grade)
+
+        graded_n = graded.sum(axis=0)
+        grade_mean = sum_in_order(matrix.grade[:, None], graded) / np.maximum(graded_n, 1)
+        sum_sq = sum_in_order(np.float_power(matrix.grade[:, None] - grade_mean, 2), graded)
+        upper_n = upper.sum(axis=0).tolist()
+        lower_n = lower.sum(axis=0).tolist()
+        respondent_n = respondents.sum(axis=0).tolist()
+        graded_n, grade_mean, sum_sq = graded_n.tolist(), grade_mean.tolist(), sum_sq.tolist()
+    else:
+        totals, corrects, counts, graded_counts, grade_sums = [], [], [], [], []
+        upper_counts, lower_counts, upper_n, lower_n, respondent_n = [], [], [], [], []
+        graded_n, grade_mean, sum_sq = [], [], []
+        for j, size in enumerate(sizes):
+            answered = matrix.column(matrix.answered, j)
+            correct = matrix.column(matrix.correct, j)
+            choice = matrix.column(matrix.choice, j)
+            option_counts = [0] * size
+            option_graded = [0] * size
+            option_grades = [0.0] * size
+            correct_count = 0
+            for row in range(matrix.n_rows):
+                if choice[row] >= 0:
+                    option_counts[choice[row]] += 1
+                    if answered[row] and matrix.graded[row]:
+                        option_graded[choice[row]] += 1
+                        option_grades[choice[row]] += matrix.grade[row]
+                if choice[row] != ResponseMatrix.NO_ANSWER and correct[row]:
+                    correct_count += 1
+            totals.append(sum(answered))
+            corrects.append(correct_count)
+            counts.append(option_counts)
+            graded_counts.append(option_graded)
+            grade_sums.append(option_grades)
+
+            for group, group_counts, group_n in ((upper[j], upper_counts, upper_n),
+                                                 (lower[j], lower_counts, lower_n)):
+                tallies = [0] * size
+                for row in group:
+                    if choice[row] >= 0:
+                        tallies[choice[row]] += 1
+                group_counts.append(tallies)
+                group_n.append(len(group))
+            respondent_n.append(len(respondents[j]))
+
+            rows = matrix.graded_rows(j)
+            mean = sum_in_order(matrix.grade, rows) / max(len(rows), 1)
+            graded_n.append(len(rows))
+            grade_mean.append(mean)
+            sum_sq.append(sum((matrix.grade[row] - mean) ** 2 for row in rows))
+
+    return [{
+        "total": totals[j],
+        "correct": corrects[j],
+        "counts": counts[j],
+        "upper_counts": upper_counts[j] if respondent_n[j] >= 10 else None,
+        "lower_counts": lower_counts[j] if respondent_n[j] >= 10 else None,
+        "upper_n": upper_n[j],
+        "lower_n": lower_n[j],
+        "graded_counts": graded_counts[j],
+        "grade_sums": grade_sums[j],
+        "graded_n": graded_n[j],
+        "grade_mean": grade_mean[j],
+        "grade_sd": math.sqrt(sum_sq[j] / graded_n[j]) if graded_n[j] else 0
+    } for j in range(matrix.n_items)]
+
+
+def option_point_biserial(selections, option):
+    """
+    Point-biserial correlation between choosing an option and final grade:
+    r = (M_option - M) / S * sqrt(p / q), over graded respondents.
+    Positive for a working key, negative for a working distractor.
+    """
+    n = selections["graded_n"]
+    chose = selections["graded_counts"][option]
+    if chose < 2 or n - chose < 2:
+        return None
+    if selections["grade_sd"] == 0:
+        return 0.0
+    p = chose / n
+    mean = selections["grade_sums"][option] / chose
+    return (mean - selections["grade_mean"]) / selections["grade_sd"] * math.sqrt(p / (1 - p))
 
 
-def calculate_distractor_analysis(responses, question_id, question_data):
+def calculate_distractor_analysis(selections, question_data):
     """
-    Analyze distractor (wrong answer) selection rates.
+    Analyze distractor (wrong answer) selection rates, overall and in the
+    upper and lower groups, with each option's point-biserial.
     """
+    total_responses = selections["total"]
+    correct_count = selections["correct"]
+    if total_responses == 0:
+        return None
+
     # Build answer ID to letter mapping
     answers = question_data.get("answers", [])
     answer_map = {}
-    correct_id = None
 
     for i, ans in enumerate(answers):
         letter = chr(65 + i)  # A, B, C, D...
@@ -171,39 +659,25 @@ def calculate_distractor_analysis(responses, question_id, question_data):
             "text": ans.get("text", ""),
             "is_correct": ans.get("weight", 0) == 100
         }
-        if ans.get("weight", 0) == 100:
-            correct_id = ans["id"]
-
-    # Count selections
-    selection_counts = defaultdict(int)
-    total_responses = 0
-    correct_count = 0
-
-    for resp in responses:
-        q_resp = resp.get("responses", {}).get(str(question_id))
-        if q_resp is not None:
-            total_responses += 1
-            answer_id = q_resp.get("answer_id")
-            if answer_id:
-                selection_counts[answer_id] += 1
-                if q_resp.get("correct", False):
-                    correct_count += 1
-
-    if total_responses == 0:
-        return None
 
     # Calculate rates
     analysis = []
     wrong_total = total_responses - correct_count
+    upper_counts, lower_counts = selections["upper_counts"], selections["lower_counts"]
 
-    for ans_id, info in answer_map.items():
-        count = selection_counts.get(ans_id, 0)
+    for option, (count, (ans_id, info)) in enumerate(zip(selections["counts"], answer_map.items())):
         rate = count / total_responses if total_responses > 0 else 0
 
         distractor_rate = None
         if not info["is_correct"] and wrong_total > 0:
             distractor_rate = count / wrong_total
 
+        upper_rate = lower_rate = None
+        if upper_counts is not None and selections["upper_n"]:
+            upper_rate = upper_counts[option] / selections["upper_n"]
+        if lower_counts is not None and selections["lower_n"]:
+            lower_rate = lower_counts[option] / selections["lower_n"]
+
         analysis.append({
             "answer_id": ans_id,
             "letter": info["letter"],
@@ -211,7 +685,10 @@ def calculate_distractor_analysis(responses, question_id, question_data):
             "is_correct": info["is_correct"],
             "count": count,
             "selection_rate": rate,
-            "distractor_rate": distractor_rate
+            "distractor_rate": distractor_rate,
+            "upper_rate": upper_rate,
+            "lower_rate": lower_rate,
+            "point_biserial": option_point_biserial(selections, option)
         })
 
     # Sort by letter
@@ -224,7 +701,20 @@ def calculate_distractor_analysis(responses, question_id, question_data):
     }
 
 
-def calculate_point_biserial(responses, question_id, grades):
+def sum_in_order(values, include):
+    """
+    Per-question sums of values over included rows, added in row order.
+    include is a boolean matrix with NumPy, or a list of rows without it.
+
+    Sums are accumulated sequentially (not pairwise) so results are
+    identical to summing the same numbers in a Python loop.
+    """
+    if np is not None:
+        return np.cumsum(np.where(include, values, 0.0), axis=0)[-1]
+    return sum(values[row] for row in include)
+
+
+def calculate_point_biserial(matrix):
     """
     Calculate point-biserial correlation between item score and final grade.
     r_pb = (M_1 - M_0) / S * sqrt(p * q)
@@ -233,66 +723,398 @@ def calculate_point_biserial(responses, question_id, grades):
     - M_0 = mean final grade of students who got item wrong
     - S = standard deviation of all final grades
     - p = proportion correct, q = 1 - p
-    """
-    correct_grades = []
-    incorrect_grades = []
 
-    for resp in responses:
-        student_id = resp["student_id"]
-        q_resp = resp.get("responses", {}).get(str(question_id))
+    Grades are summed correct-first, then incorrect, in submission order.
+    """
+    if matrix.n_rows == 0:
+        return [None] * matrix.n_items
+
+    if np is not None:
+        valid = matrix.answered & matrix.graded[:, None]
+        in_correct = valid & matrix.correct
+        in_incorrect = valid & ~matrix.correct
+        grade = matrix.grade[:, None]
+        stacked = np.vstack((in_correct, in_incorrect))
+
+        n1 = in_correct.sum(axis=0).tolist()
+        n0 = in_incorrect.sum(axis=0).tolist()
+        sum1 = sum_in_order(grade, in_correct).tolist()
+        sum0 = sum_in_order(grade, in_incorrect).tolist()
+        sum_all = sum_in_order(np.vstack((grade, grade)), stacked)
+        mean_all = sum_all / np.maximum(valid.sum(axis=0), 1)
+        # float_power squares via pow(), like Python's ** (x * x can differ in the last bit)
+        deviation = np.float_power(grade - mean_all, 2)
+        sum_sq = sum_in_order(np.vstack((deviation, deviation)), stacked).tolist()
+        sum_all = sum_all.tolist()
+    else:
+        n1, n0, sum1, sum0, sum_all, sum_sq = [], [], [], [], [], []
+        for j in range(matrix.n_items):
+            correct = matrix.column(matrix.correct, j)
+            rows = matrix.graded_rows(j)
+            correct_rows = [row for row in rows if correct[row]]
+            incorrect_rows = [row for row in rows if not correct[row]]
+            ordered = correct_rows + incorrect_rows
+            n1.append(len(correct_rows))
+            n0.append(len(incorrect_rows))
+            sum1.append(sum_in_order(matrix.grade, correct_rows))
+            sum0.append(sum_in_order(matrix.grade, incorrect_rows))
+            sum_all.append(sum_in_order(matrix.grade, ordered))
+            mean = sum_all[-1] / len(ordered) if ordered else 0
+            sum_sq.append(sum((matrix.grade[row] - mean) ** 2 for row in ordered))
+
+    results = []
+    for j in range(matrix.n_items):
+        if n1[j] < 2 or n0[j] < 2:
+            results.append(None)
+            continue
+
+        # Calculate means
+        m1 = sum1[j] / n1[j]
+        m0 = sum0[j] / n0[j]
+
+        # Calculate overall standard deviation
+        n = n1[j] + n0[j]
+        variance = sum_sq[j] / n
+        std_dev = math.sqrt(variance) if variance > 0 else 1
+
+        # Calculate proportions
+        p = n1[j] / n
+        q = 1 - p
+
+        # Point-biserial correlation
+        if std_dev > 0 and p > 0 and q > 0:
+            r_pb = (m1 - m0) / std_dev * math.sqrt(p * q)
+        else:
+            r_pb = 0
+
+        results.append({
+            "r_pb": r_pb,
+            "mean_correct": m1,
+            "mean_incorrect": m0,
+            "n_correct": n1[j],
+            "n_incorrect": n0[j]
+        })
 
-        if q_resp is not None and student_id in grades:
-            final_score = grades[student_id].get("final_score") or grades[student_id].get("current_score")
-            if final_score is not None:
-                if q_resp.get("correct", False):
-                    correct_grades.append(final_score)
-                else:
-                    incorrect_grades.append(final_score)
+    return results
 
-    if len(correct_grades) < 2 or len(incorrect_grades) < 2:
-        return None
 
-    # Calculate means
-    m1 = sum(correct_grades) / len(correct_grades)
-    m0 = sum(incorrect_grades) / len(incorrect_grades)
+def calculate_reliability(matrix):
+    """
+    Calculate quiz reliability and each question's contribution to it.
 
-    # Calculate overall standard deviation
-    all_grades = correct_grades + incorrect_grades
-    mean_all = sum(all_grades) / len(all_grades)
-    variance = sum((x - mean_all) ** 2 for x in all_grades) / len(all_grades)
-    std_dev = math.sqrt(variance) if variance > 0 else 1
+    KR-20 (Cronbach's alpha for right/wrong items) treats an unanswered
+    question as wrong. alpha-if-deleted and the corrected item-total
+    correlation (the item against the total of the other items) follow
+    from the same running sums, without rescoring the quiz per item:
 
-    # Calculate proportions
-    n = len(all_grades)
-    p = len(correct_grades) / n
-    q = 1 - p
+        var(T - X_j) = var(T) - 2 cov(X_j, T) + var(X_j)
+        cov(X_j, T - X_j) = cov(X_j, T) - var(X_j)
 
-    # Point-biserial correlation
-    if std_dev > 0 and p > 0 and q > 0:
-        r_pb = (m1 - m0) / std_dev * math.sqrt(p * q)
+    Returns (quiz-level summary, one dict per question).
+    """
+    n, k = matrix.n_rows, matrix.n_items
+
+    # Running sums: item scores, total scores, and item x total products
+    if np is not None:
+        scores = matrix.correct.astype(np.int64)
+        totals = scores.sum(axis=1)
+        sum_x = scores.sum(axis=0).tolist()
+        sum_xt = (totals @ scores).tolist()
+        sum_t = int(totals.sum())
+        sum_tt = int(totals @ totals)
     else:
-        r_pb = 0
+        columns = [matrix.column(matrix.correct, j) for j in range(k)]
+        totals = [sum(col[row] for col in columns) for row in range(n)]
+        sum_x = [sum(col) for col in columns]
+        sum_xt = [sum(t for x, t in zip(col, totals) if x) for col in columns]
+        sum_t = sum(totals)
+        sum_tt = sum(t * t for t in totals)
+
+    # Scores are whole numbers, so n^2 times each (co)variance is an exact
+    # integer; the n^2 factors cancel in every ratio below
+    var_t = n * sum_tt - sum_t * sum_t
+    var_x = [s * (n - s) for s in sum_x]
+    cov_xt = [n * sxt - s * sum_t for s, sxt in zip(sum_x, sum_xt)]
+    total_var_x = sum(var_x)
+
+    kr20 = None
+    if k > 1 and var_t > 0:
+        kr20 = k / (k - 1) * (1 - total_var_x / var_t)
+
+    items = []
+    for j in range(k):
+        var_rest = var_t - 2 * cov_xt[j] + var_x[j]
+
+        alpha_if_deleted = None
+        if k > 2 and var_rest > 0:
+            alpha_if_deleted = (k - 1) / (k - 2) * (1 - (total_var_x - var_x[j]) / var_rest)
+
+        corrected = None
+        if var_x[j] > 0 and var_rest > 0:
+            corrected = (cov_xt[j] - var_x[j]) / math.sqrt(var_x[j] * var_rest)
+
+        items.append({
+            "alpha_if_deleted": alpha_if_deleted,
+            "corrected_item_total": corrected
+        })
 
-    return {
-        "r_pb": r_pb,
-        "mean_correct": m1,
-        "mean_incorrect": m0,
-        "n_correct": len(correct_grades),
-        "n_incorrect": len(incorrect_grades)
+    summary = {
+        "kr20": kr20,
+        "items": k,
+        "mean_items_correct": sum_t / n,
+        "variance_items_correct": var_t / (n * n)
     }
+    return summary, items
+
+
+ATTEMPT_POLICIES = ("all", "first", "last", "kept", "best")
+
+
+def attempt_policy(config):
+    """Which of a student's attempts to analyze (default: all of them)."""
+    return config.get("attempts", {}).get("policy", "all")
 
 
-def evaluate_metrics(difficulty, discrimination, point_biserial, config):
+def select_attempts(submissions, policy):
+    """
+    Pick one submission per student under an attempt policy, in one pass
+    over the submissions with a per-student index of the best row so far.
+
+    first/last: the lowest/highest attempt number. kept: the attempt whose
+    score Canvas kept (score == kept_score; the latest if several or none
+    match). best: the highest score, earliest attempt on ties. Returns one
+    keep flag per row, or None for "all".
+    """
+    if policy == "all":
+        return None
+    if policy not in ATTEMPT_POLICIES:
+        raise ValueError(f"Unknown attempt policy: {policy}")
+
+    def rank(row):
+        sub = submissions[row]
+        attempt = sub.get("attempt") or 0
+        score = sub.get("score") or 0
+        if policy == "first":
+            return (-attempt, -row)
+        if policy == "last":
+            return (attempt, row)
+        if policy == "kept":
+            return (score == (sub.get("kept_score") or 0), attempt, row)
+        return (score, -attempt, -row)  # best
+
+    chosen = {}
+    for row, sub in enumerate(submissions):
+        current = chosen.get(sub["student_id"])
+        if current is None or rank(row) > rank(current):
+            chosen[sub["student_id"]] = row
+
+    keep = [False] * len(submissions)
+    for row in chosen.values():
+        keep[row] = True
+    return keep
+
+
+def get_timing_settings(config):
+    """Timing analysis settings from config, with defaults."""
+    settings = {"rapid_guess_fraction": 0.1, "exclude_rapid_guessers": False}
+    settings.update(config.get("timing", {}))
+    return settings
+
+
+def quantile(ordered, q):
+    """Quantile of sorted values, interpolating linearly between ranks."""
+    position = (len(ordered) - 1) * q
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def correlation(xs, ys):
+    """Pearson correlation, or None if either variable is constant (or n < 3)."""
+    n = len(xs)
+    if n < 3:
+        return None
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    if sxx <= 0 or syy <= 0:
+        return None
+    return sxy / math.sqrt(sxx * syy)
+
+
+def calculate_timing(matrix, submissions, settings):
+    """
+    Completion-time statistics for a quiz.
+
+    A submission is a rapid guess when it took less than
+    rapid_guess_fraction of the quiz's median completion time (a normative
+    threshold). Speed versus accuracy is the correlation between time
+    spent and proportion correct. The summary lists the rapid-guessing
+    submissions (anonymized student, attempt and seconds) for follow-up;
+    the generated reports only show the count.
+    Returns (summary, one rapid-guess bool per row), or (None, None) if no
+    submission has a completion time.
+    """
+    if np is not None:
+        timed = np.isfinite(matrix.time_spent).tolist()
+        answered = matrix.answered.sum(axis=1).tolist()
+        correct = matrix.correct.sum(axis=1).tolist()
+    else:
+        timed = [not math.isnan(t) for t in matrix.time_spent]
+        k = matrix.n_items
+        answered = [sum(matrix.answered[row * k:(row + 1) * k]) for row in range(matrix.n_rows)]
+        correct = [sum(matrix.correct[row * k:(row + 1) * k]) for row in range(matrix.n_rows)]
+    times = [float(t) for t in matrix.time_spent]
+
+    ordered = sorted(t for t, has_time in zip(times, timed) if has_time)
+    if not ordered:
+        return None, None
+
+    median = quantile(ordered, 0.5)
+    threshold = settings["rapid_guess_fraction"] * median
+    rapid = [has_time and t < threshold for t, has_time in zip(times, timed)]
+    accuracy = [c / a if a else None for c, a in zip(correct, answered)]
+
+    def mean_accuracy(rows):
+        values = [accuracy[row] for row in rows if accuracy[row] is not None]
+        return sum(values) / len(values) if values else None
+
+    paired = [(times[row], accuracy[row]) for row in range(matrix.n_rows)
+              if timed[row] and accuracy[row] is not None]
+    submitted = sorted(sub["submitted_at"] for sub in submissions if sub.get("submitted_at"))
+
+    summary = {
+        "timed_submissions": len(ordered),
+        "mean_seconds": sum(ordered) / len(ordered),
+        "min_seconds": ordered[0],
+        "max_seconds": ordered[-1],
+        "percentiles": {str(p): quantile(ordered, p / 100) for p in (10, 25, 50, 75, 90)},
+        "rapid_guess_threshold_seconds": threshold,
+        "rapid_guessers": sum(rapid),
+        "rapid_guess_submissions": [
+            {"student_id": sub.get("student_id"), "attempt": sub.get("attempt", 1), "seconds": t}
+            for sub, t, is_rapid in zip(submissions, times, rapid) if is_rapid
+        ],
+        "rapid_guess_accuracy": mean_accuracy([row for row in range(matrix.n_rows) if rapid[row]]),
+        "other_accuracy": mean_accuracy([row for row in range(matrix.n_rows) if timed[row] and not rapid[row]]),
+        "speed_accuracy_r": correlation([t for t, _ in paired], [a for _, a in paired]),
+        "first_submitted_at": submitted[0] if submitted else None,
+        "last_submitted_at": submitted[-1] if submitted else None,
+        "excluded_from_item_statistics": False
+    }
+    return summary, rapid
+
+
+# Resamples per block are limited so a block's ranking x question weight
+# arrays stay around this many elements
+BOOTSTRAP_BLOCK_ELEMENTS = 4_000_000
+
+
+def bootstrap_resamples(matrix, method, resamples, seed):
+    """
+    Bootstrap p, D and r_pb for every question.
+
+    Submissions are resampled with replacement. Each resample is a row of
+    weights (how many times each submission was drawn), so the statistics
+    for a whole block of resamples are weighted sums over the response
+    matrix. Returns three resamples x question arrays, NaN where a
+    statistic is undefined in a resample.
+    """
+    n = matrix.n_rows
+    rng = np.random.default_rng(seed)
+
+    answered = matrix.answered.astype(np.float64)
+    correct = matrix.correct.astype(np.float64)
+    valid = answered * matrix.graded[:, None]
+    grade = np.where(matrix.graded, matrix.grade, 0.0)[:, None]
+    in_correct = valid * correct
+    in_incorrect = valid - in_correct
+    ranked_answered = answered[matrix.ranking]
+    ranked_correct = correct[matrix.ranking]
+
+    block = max(1, BOOTSTRAP_BLOCK_ELEMENTS // max(1, len(matrix.ranking) * matrix.n_items))
+    p_blocks, d_blocks, r_blocks = [], [], []
+
+    for start in range(0, resamples, block):
+        b = min(block, resamples - start)
+        draws = rng.integers(0, n, size=(b, n)) + n * np.arange(b)[:, None]
+        weights = np.bincount(draws.ravel(), minlength=b * n).reshape(b, n).astype(np.float64)
+
+        # Difficulty
+        p_blocks.append((weights @ correct) / (weights @ answered))
+
+        # Point-biserial, from weighted counts, sums and sums of squares
+        n1 = weights @ in_correct
+        n0 = weights @ in_incorrect
+        sum1 = weights @ (in_correct * grade)
+        sum0 = weights @ (in_incorrect * grade)
+        total = n1 + n0
+        variance = (weights @ (valid * grade ** 2)) / total - ((sum1 + sum0) / total) ** 2
+        r_pb = (sum1 / n1 - sum0 / n0) / np.sqrt(variance) * np.sqrt(n1 / total * n0 / total)
+        r_pb = np.where(variance > 0, r_pb, 0.0)
+        r_blocks.append(np.where((n1 >= 2) & (n0 >= 2), r_pb, np.nan))
+
+        # Discrimination: each ranked respondent covers the interval
+        # (cum - w, cum] of its question's ranking; the groups are the
+        # first and last `size` units of that ranking
+        w = weights[:, matrix.ranking][:, :, None] * ranked_answered
+        cum = np.cumsum(w, axis=1)
+        counts = cum[:, -1, :] if cum.shape[1] else np.zeros((b, matrix.n_items))
+        size = group_sizes(counts, method)
+        upper = np.clip(np.minimum(cum, size[:, None, :]) - (cum - w), 0, None)
+        lower = np.clip(cum - np.maximum(cum - w, (counts - size)[:, None, :]), 0, None)
+        d = ((upper * ranked_correct).sum(axis=1) - (lower * ranked_correct).sum(axis=1)) / size
+        d_blocks.append(np.where(counts >= 10, d, np.nan))
+
+    return np.vstack(p_blocks), np.vstack(d_blocks), np.vstack(r_blocks)
+
+
+def calculate_bootstrap_intervals(matrix, method, bootstrap_config):
+    """
+    Percentile bootstrap confidence intervals for each question's p, D and
+    r_pb. Returns one {"difficulty": [low, high], ...} dict per question,
+    with None for statistics that could not be estimated.
+    """
+    resamples = bootstrap_config.get("resamples", 2000)
+    confidence = bootstrap_config.get("confidence", 0.95)
+    tail = (1 - confidence) / 2
+
+    with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # All-NaN questions
+        samples = bootstrap_resamples(matrix, method, resamples, bootstrap_config.get("seed"))
+        bounds = [np.nanquantile(stat, [tail, 1 - tail], axis=0) for stat in samples]
+
+    intervals = []
+    for j in range(matrix.n_items):
+        interval = {"resamples": resamples, "confidence": confidence}
+        for name, (low, high) in zip(("difficulty", "discrimination", "point_biserial"), bounds):
+            interval[name] = None if np.isnan(low[j]) else [float(low[j]), float(high[j])]
+        intervals.append(interval)
+    return intervals
+
+
+def evaluate_metrics(difficulty, discrimination, point_biserial, config, intervals=None):
     """
     Evaluate metrics against thresholds and generate flags.
+
+    With bootstrap intervals, a metric is only flagged when its whole
+    confidence interval is past the threshold.
     """
     thresholds = config["thresholds"]
+
+    def beyond(name, value, threshold, above=False):
+        interval = intervals.get(name) if intervals else None
+        if interval is not None:
+            value = interval[0] if above else interval[1]
+        return value > threshold if above else value < threshold
+
     flags = []
     severity = "good"
 
     # Difficulty flags
     if difficulty is not None:
-        if difficulty > thresholds["difficulty"]["too_easy"]:
+        if beyond("difficulty", difficulty, thresholds["difficulty"]["too_easy"], above=True):
             flags.append({
                 "type": "difficulty",
                 "issue": "Too easy",
@@ -301,7 +1123,7 @@ def evaluate_metrics(difficulty, discrimination, point_biserial, config):
                 "recommendation": "Consider making question more challenging or removing"
             })
             severity = "warning"
-        elif difficulty < thresholds["difficulty"]["too_hard"]:
+        elif beyond("difficulty", difficulty, thresholds["difficulty"]["too_hard"]):
             flags.append({
                 "type": "difficulty",
                 "issue": "Too difficult",
@@ -314,7 +1136,7 @@ def evaluate_metrics(difficulty, discrimination, point_biserial, config):
     # Discrimination flags
     if discrimination is not None:
         d_value = discrimination["D"]
-        if d_value < thresholds["discrimination"]["critical"]:
+        if beyond("discrimination", d_value, thresholds["discrimination"]["critical"]):
             flags.append({
                 "type": "discrimination",
                 "issue": "Negative discrimination",
@@ -323,7 +1145,7 @@ def evaluate_metrics(difficulty, discrimination, point_biserial, config):
                 "recommendation": "CRITICAL: High performers getting this wrong. Check answer key and question clarity."
             })
             severity = "critical"
-        elif d_value < thresholds["discrimination"]["flag_below"]:
+        elif beyond("discrimination", d_value, thresholds["discrimination"]["flag_below"]):
             flags.append({
                 "type": "discrimination",
                 "issue": "Poor discrimination",
@@ -337,7 +1159,7 @@ def evaluate_metrics(difficulty, discrimination, point_biserial, config):
     # Point-biserial flags
     if point_biserial is not None:
         r_pb = point_biserial["r_pb"]
-        if r_pb < thresholds["point_biserial"]["flag_below"]:
+        if beyond("point_biserial", r_pb, thresholds["point_biserial"]["flag_below"]):
             flags.append({
                 "type": "point_biserial",
                 "issue": "Low correlation with final grade",
@@ -355,8 +1177,12 @@ def evaluate_metrics(difficulty, discrimination, point_biserial, config):
     }
 
 
-def analyze_quiz(quiz_data, grades, config):
-    """Analyze a single quiz and return item statistics."""
+# Bump when the statistics computed for a quiz change, to invalidate cached results
+STATISTICS_VERSION = 8
+
+
+def calculate_quiz_statistics(quiz_data, grades, config):
+    """Calculate quiz and item statistics, before flagging against thresholds."""
     results = {
         "quiz_id": quiz_data.get("quiz_id"),
         "title": quiz_data.get("title", ""),
@@ -373,8 +1199,15 @@ def analyze_quiz(quiz_data, grades, config):
         results["summary"]["error"] = "No submission or question data available"
         return results
 
+    # One submission per student, unless every attempt is analyzed
+    policy = attempt_policy(config)
+    keep = select_attempts(submissions, policy)
+    if keep is not None:
+        results["summary"]["attempts"] = {"policy": policy, "students": sum(keep)}
+
     # Calculate quiz-level statistics
-    scores = [s.get("score", 0) or 0 for s in submissions]
+    selected = submissions if keep is None else [s for s, kept in zip(submissions, keep) if kept]
+    scores = [s.get("score", 0) or 0 for s in selected]
     if scores:
         results["summary"]["mean_score"] = sum(scores) / len(scores)
         results["summary"]["median_score"] = sorted(scores)[len(scores) // 2]
@@ -384,42 +1217,76 @@ def analyze_quiz(quiz_data, grades, config):
         results["summary"]["max_score"] = max(scores)
         results["summary"]["points_possible"] = quiz_data.get("points_possible", 50)
 
-    # Analyze each question
-    total_flags = 0
-    critical_flags = 0
-
-    for q in questions:
-        q_id = q["id"]
-
-        difficulty = calculate_difficulty(submissions, q_id)
-        discrimination = calculate_discrimination(
-            submissions, q_id, grades,
-            config["grouping"]["method"]
+    # Build the response matrix once and compute each metric for all questions
+    matrix = ResponseMatrix(submissions, questions, grades,
+                            quiz_data.get("question_keys"), quiz_data.get("response_columns"))
+    if keep is not None:
+        matrix = matrix.select_rows(keep)
+
+    timing_settings = get_timing_settings(config)
+    timing, rapid = calculate_timing(matrix, selected, timing_settings)
+    if timing is not None:
+        results["summary"]["timing"] = timing
+        if timing_settings["exclude_rapid_guessers"] and any(rapid):
+            matrix = matrix.select_rows([not r for r in rapid])
+            timing["excluded_from_item_statistics"] = True
+
+    difficulties = calculate_difficulty(matrix)
+    groups = discrimination_groups(matrix, config["grouping"]["method"])
+    discriminations = calculate_discrimination(matrix, config["grouping"]["method"], groups)
+    selections = count_selections(matrix, groups)
+    point_biserials = calculate_point_biserial(matrix)
+    reliability, item_reliability = calculate_reliability(matrix)
+    results["summary"]["reliability"] = reliability
+
+    intervals = None
+    if bootstrap_enabled(config):
+        intervals = calculate_bootstrap_intervals(
+            matrix, config["grouping"]["method"], config["bootstrap"]
         )
-        distractor = calculate_distractor_analysis(submissions, q_id, q)
-        point_biserial = calculate_point_biserial(submissions, q_id, grades)
-
-        evaluation = evaluate_metrics(difficulty, discrimination, point_biserial, config)
 
-        q_result = {
-            "question_id": q_id,
+    for j, q in enumerate(questions):
+        results["questions"].append({
+            "question_id": q["id"],
             "position": q.get("position", 0),
             "text": q.get("text", "")[:200],
-            "difficulty": difficulty,
-            "discrimination": discrimination,
-            "distractor_analysis": distractor,
-            "point_biserial": point_biserial,
-            "evaluation": evaluation
-        }
+            "fingerprint": question_fingerprint(q),
+            "difficulty": difficulties[j],
+            "discrimination": discriminations[j],
+            "distractor_analysis": calculate_distractor_analysis(selections[j], q),
+            "point_biserial": point_biserials[j],
+            "reliability": item_reliability[j]
+        })
+        if intervals is not None:
+            results["questions"][-1]["bootstrap"] = intervals[j]
+
+    # Sort by position
+    results["questions"].sort(key=lambda x: x["position"])
+
+    return results
 
-        results["questions"].append(q_result)
+
+def apply_evaluation(results, config):
+    """Evaluate each question's statistics against the configured thresholds."""
+    if "error" in results["summary"]:
+        return results
+
+    total_flags = 0
+    critical_flags = 0
+
+    flag_on_ci = bootstrap_enabled(config) and config["bootstrap"].get("flag_on_ci", False)
+
+    for q_result in results["questions"]:
+        evaluation = evaluate_metrics(
+            q_result["difficulty"], q_result["discrimination"],
+            q_result["point_biserial"], config,
+            q_result.get("bootstrap") if flag_on_ci else None
+        )
+        q_result["evaluation"] = evaluation
         total_flags += evaluation["flag_count"]
         if evaluation["severity"] == "critical":
             critical_flags += 1
 
-    # Sort by position
-    results["questions"].sort(key=lambda x: x["position"])
-
     results["summary"]["total_flags"] = total_flags
     results["summary"]["critical_flags"] = critical_flags
     results["summary"]["questions_analyzed"] = len(results["questions"])
@@ -427,13 +1294,138 @@ def analyze_quiz(quiz_data, grades, config):
     return results
 
 
-def analyze_section(section_key, config):
-    """Analyze all quizzes for a section."""
-    print(f"\nAnalyzing {section_key}...")
+def bootstrap_enabled(config):
+    """Whether bootstrap intervals are on (and NumPy is available for them)."""
+    return np is not None and config.get("bootstrap", {}).get("enabled", False)
+
+
+def analyze_quiz(quiz_data, grades, config):
+    """Analyze a single quiz and return item statistics."""
+    results = calculate_quiz_statistics(quiz_data, grades, config)
+    return apply_evaluation(results, config)
+
+
+# Quiz fields that go into its statistics. Fetch metadata such as
+# fetched_at is left out, so refetching an unchanged quiz keeps its cache.
+CACHE_KEY_FIELDS = ("quiz_id", "title", "points_possible", "questions", "question_keys", "submissions")
+
+
+def quiz_cache_key(quiz_data, grades, config):
+    """
+    Hash everything a quiz's statistics depend on: its questions and
+    submissions (with their responses, or the response store columns), the
+    grades of its students, the grouping method, the attempt policy, and
+    the bootstrap and timing settings. Thresholds are left out, since
+    flags are re-evaluated on every run.
+    """
+    student_ids = sorted({s["student_id"] for s in quiz_data.get("submissions", [])})
+    grades_slice = [grades.get(sid) for sid in student_ids]
+    columns = quiz_data.get("response_columns", {})
+    content = json.dumps(
+        [STATISTICS_VERSION, {k: quiz_data.get(k) for k in CACHE_KEY_FIELDS},
+         grades_slice, config["grouping"],
+         {k: v for k, v in config.get("bootstrap", {}).items() if k != "flag_on_ci"}
+         if bootstrap_enabled(config) else None,
+         get_timing_settings(config), attempt_policy(config)],
+        sort_keys=True
+    )
+    digest = hashlib.sha256(content.encode())
+    for name in sorted(columns):
+        digest.update(columns[name])
+    return digest.hexdigest()
+
+
+def analyze_quiz_cached(quiz_data, grades, config, cache_dir=None):
+    """
+    Analyze a quiz, reusing statistics cached in cache_dir when the quiz's
+    data is unchanged. Returns (results, whether the cache was used).
+    """
+    if cache_dir is None:
+        return analyze_quiz(quiz_data, grades, config), False
+
+    key = quiz_cache_key(quiz_data, grades, config)
+    cache_file = cache_dir / f"quiz_{quiz_data.get('quiz_id')}.json"
+
+    if cache_file.exists():
+        try:
+            with open(cache_file) as f:
+                cached = json.load(f)
+            if cached.get("key") == key:
+                return apply_evaluation(cached["statistics"], config), True
+        except (ValueError, KeyError):
+            pass  # Unreadable cache entry; recompute it
 
-    # Load data
-    quiz_data = load_quiz_data(section_key, config)
+    statistics = calculate_quiz_statistics(quiz_data, grades, config)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_suffix(".tmp")
+    with open(tmp_file, "w") as f:
+        json.dump({"key": key, "statistics": statistics}, f)
+    os.replace(tmp_file, cache_file)
+
+    return apply_evaluation(statistics, config), False
+
+
+def map_bounded(pool, fn, items, window, *args):
+    """pool.map(fn, items, *args) with at most `window` items in flight."""
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def load_section(section_key, config, pool=None, use_cache=True, stream=None):
+    """
+    Load a section's data and start analyzing its quizzes.
+
+    With a process pool, every quiz is queued immediately, so several
+    sections can be in progress at once. Results are returned in quiz order,
+    as (results, cached) pairs.
+
+    With stream set, quizzes are instead read one at a time as results are
+    consumed, with at most `stream` quizzes queued on the pool.
+    """
     grades = load_grades_data(section_key, config)
+    if stream:
+        quizzes = iter_quiz_data(section_key, config)
+    else:
+        quizzes = load_quiz_data(section_key, config).get("quizzes", [])
+
+    cache_dir = None
+    if use_cache:
+        cache_dir = Path(__file__).parent.parent / config["paths"]["processed"] / "cache" / section_key
+
+    if pool is not None and stream:
+        quiz_results = map_bounded(
+            pool, analyze_quiz_cached, quizzes, stream, grades, config, cache_dir
+        )
+    elif pool is not None:
+        quiz_results = pool.map(
+            analyze_quiz_cached, quizzes, repeat(grades), repeat(config), repeat(cache_dir)
+        )
+    else:
+        quiz_results = (analyze_quiz_cached(quiz, grades, config, cache_dir) for quiz in quizzes)
+
+    return grades, quiz_results
+
+
+def analyze_section(section_key, config, pool=None, loaded=None, use_cache=True, stream=None,
+                    history=True):
+    """
+    Analyze all quizzes for a section.
+
+    Each quiz's results are appended to {section}_analysis.json as soon as
+    they are ready, and (with history) to the item history database. With
+    stream set, they are not kept in memory either, and the returned
+    results have an empty quiz list.
+    """
+    print(f"\nAnalyzing {section_key}...")
+
+    # Load data (unless already queued by load_section)
+    grades, quiz_results = loaded or load_section(section_key, config, pool, use_cache, stream)
 
     if not grades:
         print("  Warning: No grades data found. Discrimination and correlation analysis limited.")
@@ -448,28 +1440,42 @@ def analyze_section(section_key, config):
         "quizzes": []
     }
 
-    for quiz in quiz_data.get("quizzes", []):
-        quiz_results = analyze_quiz(quiz, grades, config)
-        results["quizzes"].append(quiz_results)
-        print(f"  Analyzed: {quiz_results['title']} - {quiz_results['summary'].get('total_flags', 0)} flags")
-
-    # Save results
     output_dir = Path(__file__).parent.parent / config["paths"]["processed"]
     output_dir.mkdir(parents=True, exist_ok=True)
-
     output_file = output_dir / f"{section_key}_analysis.json"
-    with open(output_file, "w") as f:
-        json.dump(results, f, indent=2)
-
+    writer = QuizStreamWriter(output_file, {k: v for k, v in results.items() if k != "quizzes"})
+
+    item_history = None
+    if history:
+        from item_history import HISTORY_FILE, ItemHistory
+        item_history = ItemHistory(output_dir / HISTORY_FILE, config)
+        semester = config["courses"].get(section_key, {}).get("semester")
+
+    total_quizzes = total_flags = critical = cached_count = 0
+    for quiz_result, cached in quiz_results:
+        writer.write_quiz(json.dumps(quiz_result, indent=2))
+        if item_history is not None:
+            item_history.record_quiz(section_key, semester, quiz_result, results["analyzed_at"])
+        if not stream:
+            results["quizzes"].append(quiz_result)
+
+        total_quizzes += 1
+        total_flags += quiz_result["summary"].get("total_flags", 0)
+        critical += quiz_result["summary"].get("critical_flags", 0)
+        cached_count += cached
+        note = " (cached)" if cached else ""
+        print(f"  Analyzed: {quiz_result['title']} - {quiz_result['summary'].get('total_flags', 0)} flags{note}")
+
+    writer.close()
     print(f"\n  Analysis saved to {output_file}")
+    if item_history is not None:
+        item_history.close()
 
     # Summary
-    total_quizzes = len(results["quizzes"])
-    total_flags = sum(q["summary"].get("total_flags", 0) for q in results["quizzes"])
-    critical = sum(q["summary"].get("critical_flags", 0) for q in results["quizzes"])
 
     print(f"\n  Summary:")
-    print(f"    Quizzes analyzed: {total_quizzes}")
+    reused = f" ({cached_count} unchanged, reused from cache)" if cached_count else ""
+    print(f"    Quizzes analyzed: {total_quizzes}{reused}")
     print(f"    Total flagged issues: {total_flags}")
     print(f"    Critical issues: {critical}")
 
@@ -495,6 +1501,52 @@ def main():
         action="store_true",
         help="Run full analysis including report generation"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for analyzing quizzes (default: 1)"
+    )
+    parser.add_argument(
+        "--bootstrap",
+        action="store_true",
+        help="Add bootstrap confidence intervals for p, D and r_pb"
+    )
+    parser.add_argument(
+        "--attempts",
+        choices=ATTEMPT_POLICIES,
+        help="Which attempt to analyze for students with several (default: attempts.policy in config)"
+    )
+    parser.add_argument(
+        "--exclude-rapid-guessers",
+        action="store_true",
+        help="Leave rapid-guessing submissions out of the item statistics"
+    )
+    parser.add_argument(
+        "--irt",
+        action="store_true",
+        help="Also calibrate IRT item parameters from all sections (requires NumPy)"
+    )
+    parser.add_argument(
+        "--dif",
+        action="store_true",
+        help="Also compare parallel items across sections for DIF (requires NumPy)"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Load and analyze one quiz at a time, keeping memory use flat for large archives"
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Don't add this run's results to the item history database"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute every quiz instead of reusing cached statistics"
+    )
 
     args = parser.parse_args()
 
@@ -502,13 +1554,48 @@ def main():
         parser.print_help()
         sys.exit(1)
 
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
     config = load_config()
+    use_cache = not args.no_cache
+
+    if args.bootstrap:
+        config.setdefault("bootstrap", {})["enabled"] = True
+    if args.attempts:
+        config.setdefault("attempts", {})["policy"] = args.attempts
+    if args.exclude_rapid_guessers:
+        config.setdefault("timing", {})["exclude_rapid_guessers"] = True
+    if config.get("bootstrap", {}).get("enabled") and np is None:
+        print("Warning: Bootstrap intervals require NumPy (pip install numpy); skipping them.")
+
+    pool = ProcessPoolExecutor(max_workers=args.jobs) if args.jobs > 1 else None
+    stream = 2 * args.jobs if args.stream else None  # Quizzes in flight at once
 
     if args.all:
+        # Queue all sections up front so workers move on to the next
+        # section's quizzes while earlier ones are still finishing
+        loaded = {}
+        if pool is not None and not stream:
+            for section_key in config["courses"]:
+                loaded[section_key] = load_section(section_key, config, pool, use_cache)
         for section_key in config["courses"]:
-            analyze_section(section_key, config)
+            analyze_section(section_key, config, pool, loaded.get(section_key), use_cache, stream,
+                            not args.no_history)
     else:
-        analyze_section(args.section, config)
+        analyze_section(args.section, config, pool, use_cache=use_cache, stream=stream,
+                        history=not args.no_history)
+
+    if pool is not None:
+        pool.shutdown()
+
+    if args.irt:
+        from calibrate_irt import calibrate
+        calibrate(config)
+
+    if args.dif:
+        from compare_sections import compare_sections
+        compare_sections(list(config["courses"]), config)
 
     if args.full:
         print("\nGenerating reports...")
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Calibrate item response theory (IRT) parameters from pooled quiz data.
+
+Classical p and D values depend on who happened to take a quiz. This pools
+every section's responses (including archived terms left in data/raw) and
+fits a 1PL or 2PL logistic model by marginal maximum likelihood: EM over a
+normal ability distribution, with Newton steps for all items at once.
+Items are matched across sections and terms by a fingerprint of their
+question and answer text. Requires NumPy.
+
+Usage:
+    python calibrate_irt.py
+    python calibrate_irt.py --model 1PL
+    python calibrate_irt.py --cold-start
+"""
+
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analyze_quiz_performance import (load_config, load_quiz_data, question_fingerprint,
+                                      select_attempts, ResponseMatrix)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CALIBRATION_FILE = "irt_calibration.json"
+MODELS = ("1PL", "2PL")
+
+# Weak normal priors on the slope (around 1) and intercept keep items that
+# nearly everyone gets right (or wrong) from drifting off to infinity
+SLOPE_PRIOR_SD = 1.0
+INTERCEPT_PRIOR_SD = 4.0
+SLOPE_RANGE = (0.05, 6.0)
+MAX_STEP = 1.0
+
+
+def get_irt_settings(config):
+    """IRT settings from config, with defaults."""
+    settings = {"model": "2PL", "quadrature_points": 21, "max_iterations": 500, "tolerance": 1e-4}
+    settings.update(config.get("irt", {}))
+    return settings
+
+
+def find_sections(config):
+    """Configured sections plus any archived section data left in data/raw."""
+    raw_dir = Path(__file__).parent.parent / config["paths"]["raw_data"]
+    sections = [key for key in config["courses"] if (raw_dir / key).exists()]
+    if raw_dir.exists():
+        for path in sorted(raw_dir.iterdir()):
+            has_data = (path / "all_quizzes.json").exists() or (path / "responses").exists()
+            if path.is_dir() and path.name not in sections and has_data:
+                sections.append(path.name)
+    return sections
+
+
+def build_pooled_responses(sections, config):
+    """
+    Build a person x item response matrix from every section.
+
+    A person is a student in a section; an item is a question fingerprint.
+    When a student has several attempts at a quiz, the latest is used.
+    Returns (scores, observed, items, persons, quizzes): person x item 0/1
+    arrays of correct and answered responses, item and person keys, and
+    each section's quizzes as (quiz_id, title, [(question, item index)]).
+    """
+    persons = {}
+    items = {}
+    quizzes = {section_key: [] for section_key in sections}
+    blocks = []
+
+    for section_key in sections:
+        quiz_data = load_quiz_data(section_key, config)
+        for quiz in quiz_data.get("quizzes", []):
+            submissions = quiz.get("submissions", [])
+            questions = quiz.get("questions", [])
+            if not submissions or not questions:
+                continue
+
+            matrix = ResponseMatrix(submissions, questions, None,
+                                    quiz.get("question_keys"), quiz.get("response_columns"))
+            rows = np.flatnonzero(select_attempts(submissions, "last"))
+            person_index = np.array([
+                persons.setdefault((section_key, submissions[row]["student_id"]), len(persons))
+                for row in rows
+            ], dtype=np.int64)
+
+            item_index = []
+            for q in questions:
+                key = question_fingerprint(q)
+                if key not in items:
+                    items[key] = {"fingerprint": key, "index": len(items),
+                                  "question_ids": [], "sections": []}
+                item = items[key]
+                if q["id"] not in item["question_ids"]:
+                    item["question_ids"].append(q["id"])
+                if section_key not in item["sections"]:
+                    item["sections"].append(section_key)
+                item_index.append(item["index"])
+            quizzes[section_key].append((quiz.get("quiz_id"), quiz.get("title", ""),
+                                         list(zip(questions, item_index))))
+
+            answered = matrix.answered[rows]
+            person_rows, cols = np.nonzero(answered)
+            blocks.append((person_index[person_rows], np.array(item_index)[cols],
+                           matrix.correct[rows][person_rows, cols]))
+
+    scores = np.zeros((len(persons), len(items)), dtype=np.float32)
+    observed = np.zeros((len(persons), len(items)), dtype=np.float32)
+    for person, item, correct in blocks:
+        observed[person, item] = 1
+        scores[person, item] = correct
+
+    return scores, observed, list(items.values()), list(persons), quizzes
+
+
+def log_sigmoid(z):
+    """log(1 / (1 + exp(-z))), without overflow."""
+    return -np.logaddexp(0, -z)
+
+
+def fit_irt(scores, observed, model, slopes, intercepts, settings):
+    """
+    Fit item slopes and intercepts (P = logistic(a * theta + c)) by EM.
+
+    E-step: posterior of each person's ability over Gauss-Hermite
+    quadrature nodes, as two person x item x node matrix products. M-step:
+    one Newton step per item on the expected complete-data likelihood, for
+    all items at once (2x2 systems for 2PL; the slope stays 1 for 1PL).
+    Returns (slopes, intercepts, posterior, nodes, iterations, converged,
+    log likelihood).
+    """
+    nodes, weights = np.polynomial.hermite_e.hermegauss(settings["quadrature_points"])
+    log_weights = np.log(weights / weights.sum())
+    wrong = observed - scores
+    converged = False
+
+    for iteration in range(1, settings["max_iterations"] + 1):
+        # E-step
+        z = slopes[:, None] * nodes + intercepts[:, None]  # item x node
+        log_like = (scores @ log_sigmoid(z).astype(np.float32)
+                    + wrong @ log_sigmoid(-z).astype(np.float32)).astype(np.float64)
+        log_like += log_weights
+        peak = log_like.max(axis=1, keepdims=True)
+        posterior = np.exp(log_like - peak)
+        total = posterior.sum(axis=1, keepdims=True)
+        posterior /= total
+        log_likelihood = float((peak + np.log(total)).sum())
+
+        expected_n = observed.T @ posterior.astype(np.float32)  # item x node
+        expected_r = scores.T @ posterior.astype(np.float32)
+
+        # M-step (one Newton step, with the priors' gradient and curvature)
+        p = np.exp(log_sigmoid(z))
+        residual = expected_r - expected_n * p
+        info = expected_n * p * (1 - p)
+        grad_c = residual.sum(axis=1) - intercepts / INTERCEPT_PRIOR_SD ** 2
+        hess_cc = info.sum(axis=1) + 1 / INTERCEPT_PRIOR_SD ** 2
+
+        if model == "2PL":
+            grad_a = residual @ nodes - (slopes - 1) / SLOPE_PRIOR_SD ** 2
+            hess_aa = info @ nodes ** 2 + 1 / SLOPE_PRIOR_SD ** 2
+            hess_ac = info @ nodes
+            det = hess_aa * hess_cc - hess_ac ** 2
+            step_a = (hess_cc * grad_a - hess_ac * grad_c) / det
+            step_c = (hess_aa * grad_c - hess_ac * grad_a) / det
+        else:
+            step_a = np.zeros_like(slopes)
+            step_c = grad_c / hess_cc
+
+        step_a = np.clip(step_a, -MAX_STEP, MAX_STEP)
+        step_c = np.clip(step_c, -MAX_STEP, MAX_STEP)
+        slopes = np.clip(slopes + step_a, *SLOPE_RANGE)
+        intercepts = intercepts + step_c
+
+        if max(np.abs(step_a).max(initial=0), np.abs(step_c).max(initial=0)) < settings["tolerance"]:
+            converged = True
+            break
+
+    return slopes, intercepts, posterior, nodes, iteration, converged, log_likelihood
+
+
+def load_previous_calibration(output_dir):
+    """Item parameters from the last calibration, by fingerprint."""
+    calibration_file = output_dir / CALIBRATION_FILE
+    if not calibration_file.exists():
+        return {}
+    with open(calibration_file) as f:
+        return {item["fingerprint"]: item for item in json.load(f).get("items", [])}
+
+
+def calibrate(config, model=None, warm_start=True):
+    """Calibrate all sections' items, and save the pooled and per-section results."""
+    if np is None:
+        print("Error: IRT calibration requires NumPy (pip install numpy)")
+        sys.exit(1)
+
+    settings = get_irt_settings(config)
+    model = (model or settings["model"]).upper()
+    if model not in MODELS:
+        print(f"Error: IRT model must be one of: {', '.join(MODELS)}")
+        sys.exit(1)
+
+    start = time.monotonic()
+    sections = find_sections(config)
+    print(f"\nCalibrating {model} IRT model for: {', '.join(sections)}")
+
+    scores, observed, items, persons, quizzes = build_pooled_responses(sections, config)
+    print(f"  {len(persons)} examinees, {len(items)} items, {int(observed.sum())} responses")
+    if not items:
+        print("  No response data to calibrate.")
+        return None
+
+    # Start from the previous calibration where items match, otherwise
+    # from each item's proportion correct
+    output_dir = Path(__file__).parent.parent / config["paths"]["processed"]
+    previous = load_previous_calibration(output_dir) if warm_start else {}
+    counts = observed.sum(axis=0)
+    p_correct = (scores.sum(axis=0) + 0.5) / (counts + 1)
+    slopes = np.ones(len(items))
+    intercepts = np.log(p_correct / (1 - p_correct)).astype(np.float64)
+    warm = 0
+    for j, item in enumerate(items):
+        prior = previous.get(item["fingerprint"])
+        if prior is not None:
+            slopes[j] = prior["a"] if model == "2PL" else 1.0
+            intercepts[j] = prior["c"]
+            warm += 1
+    if warm:
+        print(f"  Warm start: {warm} items from the previous calibration")
+
+    slopes, intercepts, posterior, nodes, iterations, converged, log_likelihood = fit_irt(
+        scores, observed, model, slopes, intercepts, settings
+    )
+    status = "converged" if converged else "did not converge"
+    print(f"  EM {status} after {iterations} iterations ({time.monotonic() - start:.1f}s)")
+
+    calibrated_at = datetime.now().isoformat()
+    item_results = []
+    for j, item in enumerate(items):
+        item_results.append({
+            "fingerprint": item["fingerprint"],
+            "question_ids": item["question_ids"],
+            "sections": item["sections"],
+            "a": float(slopes[j]),
+            "b": float(-intercepts[j] / slopes[j]),
+            "c": float(intercepts[j]),
+            "n": int(counts[j])
+        })
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / CALIBRATION_FILE, "w") as f:
+        json.dump({
+            "calibrated_at": calibrated_at,
+            "model": model,
+            "sections": sections,
+            "examinees": len(persons),
+            "iterations": iterations,
+            "converged": converged,
+            "log_likelihood": log_likelihood,
+            "items": item_results
+        }, f, indent=2)
+
+    # Per-section item parameters, next to {section}_analysis.json
+    abilities = posterior @ nodes  # EAP ability estimates
+    for section_key in sections:
+        in_section = [i for i, (key, _) in enumerate(persons) if key == section_key]
+        section_abilities = abilities[in_section]
+        section_results = {
+            "section": section_key,
+            "calibrated_at": calibrated_at,
+            "model": model,
+            "ability": {
+                "n": len(in_section),
+                "mean": float(section_abilities.mean()) if in_section else None,
+                "sd": float(section_abilities.std()) if in_section else None
+            },
+            "quizzes": []
+        }
+        for quiz_id, title, questions in quizzes[section_key]:
+            section_results["quizzes"].append({
+                "quiz_id": quiz_id,
+                "title": title,
+                "questions": [{
+                    "question_id": q["id"],
+                    "position": q.get("position", 0),
+                    "fingerprint": item_results[j]["fingerprint"],
+                    "a": item_results[j]["a"],
+                    "b": item_results[j]["b"],
+                    "n": item_results[j]["n"]
+                } for q, j in questions]
+            })
+
+        with open(output_dir / f"{section_key}_irt.json", "w") as f:
+            json.dump(section_results, f, indent=2)
+
+    print(f"  Saved item parameters to {output_dir}")
+    return item_results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Calibrate IRT item parameters from all sections' quiz data"
+    )
+    parser.add_argument(
+        "--model",
+        choices=MODELS,
+        help="IRT model (default: irt.model in config)"
+    )
+    parser.add_argument(
+        "--cold-start",
+        action="store_true",
+        help="Ignore the previous calibration and start from scratch"
+    )
+
+    args = parser.parse_args()
+    config = load_config()
+    calibrate(config, args.model, warm_start=not args.cold_start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Compare equivalent quiz items across sections (differential item functioning).
+
+Twin sections take parallel quizzes. This pairs each section's quizzes
+with the reference (first) section's by quiz number, aligns their
+questions, and tests each aligned item for differential item functioning
+with the Mantel-Haenszel procedure: students are matched on their total
+over the aligned items, so an item is only flagged when equally able
+students in the two sections do differently on it. Requires NumPy.
+
+Usage:
+    python compare_sections.py
+    python compare_sections.py spring2026_001 spring2026_002
+    python compare_sections.py --match position
+"""
+
+import re
+import sys
+import json
+import math
+import argparse
+from datetime import datetime
+from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analyze_quiz_performance import (load_config, load_quiz_data, normalize_text,
+                                      question_fingerprint, select_attempts, ResponseMatrix)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MATCH_METHODS = ("text", "position")
+
+# ETS classification of |MH D-DIF|: A (negligible) below 1, B (moderate)
+# from 1, C (large) from 1.5, each only when the MH test is significant
+ETS_MODERATE = 1.0
+ETS_LARGE = 1.5
+
+
+def get_dif_settings(config):
+    """DIF settings from config, with defaults."""
+    settings = {"match": "text", "min_similarity": 0.8, "significance": 0.05}
+    settings.update(config.get("dif", {}))
+    return settings
+
+
+def quiz_number(quiz, index):
+    """The quiz's number from its title ("Quiz 3: ..."), or its position."""
+    match = re.search(r"\d+", quiz.get("title", ""))
+    return int(match.group()) if match else index + 1
+
+
+def question_text(question):
+    """Question and answer text, normalized, for similarity matching."""
+    answers = sorted(normalize_text(a.get("text", "")) for a in question.get("answers", []))
+    return " | ".join([normalize_text(question.get("text", ""))] + answers)
+
+
+def align_questions(reference, focal, method, min_similarity):
+    """
+    Pair up the questions of two parallel quizzes.
+
+    "position" pairs questions at the same position. "text" pairs
+    identical questions first, then the most similar remaining ones
+    (at least min_similarity). Returns (reference column, focal column,
+    similarity) triples.
+    """
+    if method == "position":
+        focal_at = {q.get("position"): col for col, q in enumerate(focal)}
+        return [(col, focal_at[q.get("position")], None)
+                for col, q in enumerate(reference) if q.get("position") in focal_at]
+
+    pairs = []
+    focal_by_print = {}
+    for col, q in enumerate(focal):
+        focal_by_print.setdefault(question_fingerprint(q), []).append(col)
+    unmatched_ref, used = [], set()
+    for col, q in enumerate(reference):
+        candidates = [c for c in focal_by_print.get(question_fingerprint(q), []) if c not in used]
+        if candidates:
+            pairs.append((col, candidates[0], 1.0))
+            used.add(candidates[0])
+        else:
+            unmatched_ref.append(col)
+
+    # Greedy best-first matching of the rest by text similarity
+    unmatched_focal = [col for col in range(len(focal)) if col not in used]
+    focal_texts = {col: question_text(focal[col]) for col in unmatched_focal}
+    scored = []
+    for ref_col in unmatched_ref:
+        text = question_text(reference[ref_col])
+        for focal_col in unmatched_focal:
+            ratio = SequenceMatcher(None, text, focal_texts[focal_col]).ratio()
+            if ratio >= min_similarity:
+                scored.append((ratio, ref_col, focal_col))
+    taken_ref = set()
+    for ratio, ref_col, focal_col in sorted(scored, key=lambda s: -s[0]):
+        if ref_col not in taken_ref and focal_col not in used:
+            pairs.append((ref_col, focal_col, ratio))
+            taken_ref.add(ref_col)
+            used.add(focal_col)
+
+    return sorted(pairs)
+
+
+def latest_responses(quiz, cols):
+    """Correct and answered arrays (student x aligned question) for each student's latest attempt."""
+    submissions = quiz.get("submissions", [])
+    matrix = ResponseMatrix(submissions, quiz.get("questions", []), None,
+                            quiz.get("question_keys"), quiz.get("response_columns"))
+    rows = np.flatnonzero(select_attempts(submissions, "last"))
+    cols = np.array(cols, dtype=np.int64)
+    return matrix.correct[rows][:, cols], matrix.answered[rows][:, cols]
+
+
+def mantel_haenszel(correct, answered, focal):
+    """
+    Mantel-Haenszel DIF statistics for every item at once.
+
+    correct and answered are student x item arrays and focal marks the
+    focal group's rows. Students are stratified by their number correct;
+    one matrix product of the (stratum, group) indicator matrix with the
+    responses gives every stratum's 2x2 table for every item. Returns a
+    dict of per-item arrays.
+    """
+    scores = correct.sum(axis=1).astype(np.int64)
+    n_strata = int(scores.max(initial=0)) + 1
+    cell = scores * 2 + focal.astype(np.int64)
+    indicator = np.zeros((len(cell), 2 * n_strata))
+    indicator[np.arange(len(cell)), cell] = 1
+
+    right = (indicator.T @ correct).reshape(n_strata, 2, -1)
+    total = (indicator.T @ answered).reshape(n_strata, 2, -1)
+    a, c = right[:, 0], right[:, 1]        # reference, focal correct
+    b, d = total[:, 0] - a, total[:, 1] - c  # reference, focal wrong
+    n_ref, n_focal = total[:, 0], total[:, 1]
+    n = n_ref + n_focal
+    m_right = a + c
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        safe_n = np.where(n > 0, n, 1)
+        numerator = (a * d / safe_n).sum(axis=0)
+        denominator = (b * c / safe_n).sum(axis=0)
+        alpha = numerator / denominator
+        expected = (n_ref * m_right / safe_n).sum(axis=0)
+        # Strata with a single student have n_ref * n_focal = 0
+        variance = (n_ref * n_focal * m_right * (n - m_right)
+                    / (safe_n ** 2 * np.maximum(n - 1, 1))).sum(axis=0)
+        chi_square = (np.abs(a.sum(axis=0) - expected) - 0.5).clip(min=0) ** 2 / variance
+
+    return {
+        "n_reference": n_ref.sum(axis=0),
+        "n_focal": n_focal.sum(axis=0),
+        "correct_reference": a.sum(axis=0),
+        "correct_focal": c.sum(axis=0),
+        "alpha": alpha,
+        "chi_square": chi_square
+    }
+
+
+def ets_class(delta, p_value, significance):
+    """ETS A/B/C category for an MH D-DIF value."""
+    if delta is None or p_value is None or p_value >= significance:
+        return "A"
+    if abs(delta) >= ETS_LARGE:
+        return "C"
+    if abs(delta) >= ETS_MODERATE:
+        return "B"
+    return "A"
+
+
+def finite(value):
+    """A NumPy scalar as a float, or None if it is not finite."""
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def compare_quizzes(ref_quiz, focal_quiz, settings):
+    """DIF results for one pair of parallel quizzes."""
+    ref_questions = ref_quiz.get("questions", [])
+    focal_questions = focal_quiz.get("questions", [])
+    pairs = align_questions(ref_questions, focal_questions, settings["match"], settings["min_similarity"])
+    result = {
+        "reference_quiz_id": ref_quiz.get("quiz_id"),
+        "focal_quiz_id": focal_quiz.get("quiz_id"),
+        "title": ref_quiz.get("title", ""),
+        "aligned_items": len(pairs),
+        "items": []
+    }
+    if not pairs or not ref_quiz.get("submissions") or not focal_quiz.get("submissions"):
+        return result
+
+    ref_correct, ref_answered = latest_responses(ref_quiz, [p[0] for p in pairs])
+    focal_correct, focal_answered = latest_responses(focal_quiz, [p[1] for p in pairs])
+    correct = np.vstack((ref_correct, focal_correct)).astype(np.float64)
+    answered = np.vstack((ref_answered, focal_answered)).astype(np.float64)
+    focal = np.arange(len(correct)) >= len(ref_correct)
+    stats = mantel_haenszel(correct, answered, focal)
+
+    for j, (ref_col, focal_col, similarity) in enumerate(pairs):
+        alpha = finite(stats["alpha"][j])
+        delta = -2.35 * math.log(alpha) if alpha else None
+        chi_square = finite(stats["chi_square"][j])
+        p_value = math.erfc(math.sqrt(chi_square / 2)) if chi_square is not None else None
+        n_ref, n_focal = int(stats["n_reference"][j]), int(stats["n_focal"][j])
+
+        result["items"].append({
+            "reference_question_id": ref_questions[ref_col]["id"],
+            "focal_question_id": focal_questions[focal_col]["id"],
+            "position": ref_questions[ref_col].get("position", 0),
+            "similarity": similarity,
+            "n_reference": n_ref,
+            "n_focal": n_focal,
+            "p_reference": stats["correct_reference"][j] / n_ref if n_ref else None,
+            "p_focal": stats["correct_focal"][j] / n_focal if n_focal else None,
+            "alpha_mh": alpha,
+            "delta_mh": delta,
+            "chi_square": chi_square,
+            "p_value": p_value,
+            "ets_class": ets_class(delta, p_value, settings["significance"])
+        })
+
+    return result
+
+
+def compare_sections(sections, config, match=None):
+    """Compare every section's quizzes against the first section's, and save the results."""
+    if np is None:
+        print("Error: Cross-section comparison requires NumPy (pip install numpy)")
+        sys.exit(1)
+
+    settings = get_dif_settings(config)
+    if match:
+        settings["match"] = match
+    if settings["match"] not in MATCH_METHODS:
+        print(f"Error: DIF match must be one of: {', '.join(MATCH_METHODS)}")
+        sys.exit(1)
+
+    reference = sections[0]
+    ref_quizzes = {quiz_number(q, i): q for i, q in enumerate(load_quiz_data(reference, config).get("quizzes", []))}
+    output_dir = Path(__file__).parent.parent / config["paths"]["processed"]
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    all_results = []
+    for focal_section in sections[1:]:
+        print(f"\nComparing {focal_section} with {reference} (items matched by {settings['match']})...")
+        focal_quizzes = load_quiz_data(focal_section, config).get("quizzes", [])
+
+        results = {
+            "reference": reference,
+            "focal": focal_section,
+            "compared_at": datetime.now().isoformat(),
+            "settings": settings,
+            "quizzes": []
+        }
+        for i, focal_quiz in enumerate(focal_quizzes):
+            ref_quiz = ref_quizzes.get(quiz_number(focal_quiz, i))
+            if ref_quiz is None:
+                continue
+            quiz_result = compare_quizzes(ref_quiz, focal_quiz, settings)
+            results["quizzes"].append(quiz_result)
+
+            flagged = [item for item in quiz_result["items"] if item["ets_class"] != "A"]
+            print(f"  {quiz_result['title']}: {quiz_result['aligned_items']} aligned items, "
+                  f"{len(flagged)} with DIF")
+            for item in flagged:
+                favors = reference if item["delta_mh"] < 0 else focal_section
+                print(f"    Q{item['position']}: class {item['ets_class']}, "
+                      f"MH D-DIF {item['delta_mh']:.2f} (favors {favors})")
+
+        output_file = output_dir / f"dif_{reference}_vs_{focal_section}.json"
+        with open(output_file, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"  Saved to {output_file}")
+        all_results.append(results)
+
+    return all_results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare parallel quiz items across sections (Mantel-Haenszel DIF)"
+    )
+    parser.add_argument(
+        "sections",
+        nargs="*",
+        help="Sections to compare; the first is the reference (default: all configured sections)"
+    )
+    parser.add_argument(
+        "--match",
+        choices=MATCH_METHODS,
+        help="Align items by question text or by position (default: dif.match in config)"
+    )
+
+    args = parser.parse_args()
+    config = load_config()
+    sections = args.sections or list(config["courses"])
+
+    if len(sections) < 2:
+        parser.error("At least two sections are needed for a comparison")
+
+    compare_sections(sections, config, args.match)
+
+
+if __name__ == "__main__":
+    main()
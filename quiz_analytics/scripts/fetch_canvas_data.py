@@ -5,21 +5,70 @@ Fetch quiz performance data from Canvas LMS API.
 Usage:
     python fetch_canvas_data.py spring2026_001
     python fetch_canvas_data.py spring2026_001 --grades
+    python fetch_canvas_data.py spring2026_001 --incremental
+    python fetch_canvas_data.py spring2026_001 --resume
     python fetch_canvas_data.py --all
 """
 
+import io
 import os
+import re
+import csv
 import sys
+import html
 import json
 import argparse
+import time
+import random
+import hashlib
+import tempfile
+import threading
+import http.client
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode, urljoin, urlsplit
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from json_stream import QuizStreamWriter, recover_quizzes
+from response_store import ResponseStoreWriter
+
+# Default number of concurrent submission fetches (overridden by config.json)
+DEFAULT_MAX_WORKERS = 8
+
+# Defaults for --all: sections fetched at once, and the request budget
+# (in-flight Canvas requests) shared by all of them
+DEFAULT_SECTION_WORKERS = 4
+DEFAULT_MAX_IN_FLIGHT = 16
+
+# Socket timeout (seconds) for Canvas API connections
+REQUEST_TIMEOUT = 60
+
+# Default size limit for the on-disk response cache
+DEFAULT_CACHE_MAX_MB = 200
+
+# Retry settings for throttled (403/429) and failed (5xx) requests
+DEFAULT_MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# Journal of the sections an --all fetch has completed (in the raw data
+# directory), used by --all --resume
+RUN_CHECKPOINT_FILE = "fetch_all_checkpoint.jsonl"
+
+# Set on the headers of a response served from the cache (304) when the
+# Link header is the cached copy, which can predate pages added since
+CACHED_LINK_HEADER = "X-Cached-Link"
+
+# Response collection strategies ("quiz_report" uses one report per quiz)
+FETCH_STRATEGIES = ("submissions", "quiz_report")
+
+# Seconds to wait for Canvas to generate a quiz report
+REPORT_TIMEOUT = 300
+
 
 def load_config():
     """Load configuration from config.json (or config.yaml if available)."""
@@ -73,74 +122,640 @@ def get_canvas_token():
     return token
 
 
-def canvas_api_request(base_url, endpoint, token, params=None):
-    """Make a request to the Canvas API."""
+def log(message):
+    """
+    Print a line with a single write.
+
+    Sections and workers print from several threads; print() writes the
+    text and the newline separately, which interleaves their output.
+    """
+    sys.stdout.write(f"{message}\n")
+
+
+HTTPResult = namedtuple("HTTPResult", ["status", "reason", "headers", "body"])
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of keep-alive HTTP(S) connections, kept per host.
+
+    Uses only http.client, so fetching still needs no third-party packages.
+    Tracks how many connections were opened versus reused.
+    """
+
+    MAX_IDLE_PER_HOST = 32
+    MAX_REDIRECTS = 5
+    # Only these are resent on a fresh connection when a reused one fails;
+    # others (e.g. the POST creating a quiz report) might already have run
+    IDEMPOTENT_METHODS = ("GET", "HEAD")
+
+    def __init__(self, timeout=REQUEST_TIMEOUT):
+        self.timeout = timeout
+        self.opened = 0
+        self.reused = 0
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, scheme, host):
+        """Return (connection, reused) for a host, reusing an idle one if possible."""
+        with self._lock:
+            idle = self._idle.get((scheme, host))
+            if idle:
+                self.reused += 1
+                return idle.pop(), True
+            self.opened += 1
+
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, timeout=self.timeout)
+        else:
+            conn = http.client.HTTPConnection(host, timeout=self.timeout)
+        return conn, False
+
+    def _release(self, scheme, host, conn):
+        """Return a connection to the idle pool."""
+        with self._lock:
+            idle = self._idle.setdefault((scheme, host), [])
+            if len(idle) < self.MAX_IDLE_PER_HOST:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _send(self, method, url, headers, body):
+        """Send one request, retrying GET/HEAD if a reused connection has gone stale."""
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        while True:
+            conn, reused = self._acquire(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if reused and method in self.IDEMPOTENT_METHODS:
+                    continue  # Server closed an idle keep-alive connection
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(parts.scheme, parts.netloc, conn)
+            return HTTPResult(response.status, response.reason, response.headers, data)
+
+    def request(self, method, url, headers=None, body=None):
+        """Make an HTTP request, following redirects."""
+        headers = dict(headers or {})
+        for _ in range(self.MAX_REDIRECTS + 1):
+            result = self._send(method, url, headers, body)
+            location = result.headers.get("Location")
+            if result.status not in (301, 302, 303, 307, 308) or not location:
+                return result
+
+            next_url = urljoin(url, location)
+            # Don't leak the API token to other hosts (e.g. file storage)
+            if urlsplit(next_url).netloc != urlsplit(url).netloc:
+                headers.pop("Authorization", None)
+            if result.status == 303:
+                method, body = "GET", None
+            url = next_url
+
+        return result
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+
+
+# Shared by every Canvas request made by this process
+_connection_pool = ConnectionPool()
+
+
+def print_connection_stats():
+    """Print how many HTTP connections were opened versus reused."""
+    total = _connection_pool.opened + _connection_pool.reused
+    print(f"  HTTP requests: {total} "
+          f"({_connection_pool.opened} connections opened, "
+          f"{_connection_pool.reused} reused)")
+    if _response_cache:
+        print(f"  Served from cache (304 Not Modified): {_response_cache.hits}")
+    if _rate_limiter.waits:
+        print(f"  Rate limiter pauses: {_rate_limiter.waits}")
+
+
+class ResponseCache:
+    """
+    On-disk cache of Canvas GET responses, revalidated with ETag/Last-Modified.
+
+    Entries are keyed by URL (endpoint plus parameters). Cached entries are
+    sent as conditional requests, and a 304 reply is served from disk.
+    The least recently used entries are evicted once the cache grows past
+    max_bytes.
+    """
+
+    KEPT_HEADERS = ("ETag", "Last-Modified", "Link")
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._size = sum(p.stat().st_size for p in self.cache_dir.glob("*.json"))
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _path(self, url):
+        return self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get(self, url):
+        """Return the cached entry for a URL, or None."""
+        path = self._path(url)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def conditional_headers(self, entry):
+        """Headers that revalidate a cached entry."""
+        headers = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def put(self, url, headers, body):
+        """Store a response that carries a validator (ETag or Last-Modified)."""
+        kept = {k: headers.get(k) for k in self.KEPT_HEADERS if headers.get(k)}
+        if "ETag" not in kept and "Last-Modified" not in kept:
+            return
+
+        data = json.dumps({"url": url, "headers": kept, "body": body.decode()})
+        path = self._path(url)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+
+        with self._lock:
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+            self._size += len(data.encode()) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until under the size limit."""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= size
+
+
+# Configured by configure_response_cache(); None disables caching
+_response_cache = None
+
+
+def configure_response_cache(config, enabled=True):
+    """Set up the on-disk response cache from config (or disable it)."""
+    global _response_cache
+    if not enabled:
+        _response_cache = None
+        return
+
+    cache_dir = Path(__file__).parent.parent / config["paths"].get("cache", "data/cache")
+    max_mb = config.get("fetch", {}).get("cache_max_mb", DEFAULT_CACHE_MAX_MB)
+    _response_cache = ResponseCache(cache_dir, int(max_mb * 1024 * 1024))
+
+
+class CanvasAPIError(Exception):
+    """Raised when Canvas data cannot be fetched completely."""
+
+
+class RateLimiter:
+    """
+    Token bucket that mirrors Canvas's request quota.
+
+    Canvas reports the remaining quota in X-Rate-Limit-Remaining and the
+    cost of each request in X-Request-Cost. The bucket is resynchronized
+    from those headers after every response and refills at refill_rate
+    units per second. Requests wait once the bucket would drop below
+    reserve, which keeps concurrent workers from being throttled. Until
+    Canvas has reported a quota, requests are not held back.
+
+    It also holds the global request budget: at most max_in_flight
+    requests run at once, however many sections and workers share it.
+    """
+
+    def __init__(self, capacity=700.0, refill_rate=10.0, reserve=50.0,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.reserve = reserve
+        self.tokens = capacity
+        self.cost = 1.0  # Running estimate of X-Request-Cost
+        self.waits = 0
+        self.synced = False  # Has Canvas reported a quota yet?
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    def acquire(self):
+        """
+        Block until a request can be made without exhausting the quota.
+
+        Every acquire() must be paired with release().
+        """
+        self._in_flight.acquire()
+        waited = False
+        while True:
+            with self._lock:
+                self._refill()
+                if not self.synced or self.tokens - self.cost >= self.reserve:
+                    self.tokens -= self.cost
+                    self.waits += waited
+                    return
+                wait = (self.reserve + self.cost - self.tokens) / self.refill_rate
+            waited = True
+            time.sleep(wait)
+
+    def release(self):
+        """Return a request slot to the budget."""
+        self._in_flight.release()
+
+    def update(self, headers):
+        """Resynchronize with the quota Canvas reported for a response."""
+        remaining = headers.get("X-Rate-Limit-Remaining")
+        cost = headers.get("X-Request-Cost")
+        with self._lock:
+            try:
+                if cost is not None:
+                    self.cost = 0.8 * self.cost + 0.2 * float(cost)
+                if remaining is not None:
+                    self.tokens = min(self.capacity, float(remaining))
+                    self._updated = time.monotonic()
+                    self.synced = True
+            except ValueError:
+                pass
+
+    def throttled(self):
+        """Drain the bucket after Canvas rejected a request."""
+        with self._lock:
+            self.tokens = 0.0
+            self._updated = time.monotonic()
+            self.synced = True
+
+
+# Shared by every Canvas request made by this process
+_rate_limiter = RateLimiter()
+_max_retries = DEFAULT_MAX_RETRIES
+
+
+def configure_rate_limiter(config):
+    """Set up the shared rate limiter and retry count from config."""
+    global _rate_limiter, _max_retries
+    fetch_config = config.get("fetch", {})
+    limits = fetch_config.get("rate_limit", {})
+    _rate_limiter = RateLimiter(
+        capacity=float(limits.get("capacity", 700)),
+        refill_rate=float(limits.get("refill_per_second", 10)),
+        reserve=float(limits.get("reserve", 50)),
+        max_in_flight=int(fetch_config.get("max_in_flight", DEFAULT_MAX_IN_FLIGHT))
+    )
+    _max_retries = int(fetch_config.get("max_retries", DEFAULT_MAX_RETRIES))
+
+
+def is_throttled(result):
+    """Check whether a response means Canvas is rate limiting us."""
+    if result.status == 429:
+        return True
+    if result.status != 403:
+        return False
+    remaining = result.headers.get("X-Rate-Limit-Remaining")
+    try:
+        if remaining is not None and float(remaining) <= 0:
+            return True
+    except ValueError:
+        pass
+    return b"Rate Limit Exceeded" in result.body
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Exponential backoff with full jitter, honoring Retry-After."""
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+    try:
+        if retry_after is not None:
+            delay = max(delay, float(retry_after))
+    except ValueError:
+        pass
+    return delay
+
+
+def build_api_url(base_url, endpoint, params=None):
+    """Build a Canvas API URL from an endpoint and query parameters."""
     url = f"{base_url}/api/v1{endpoint}"
     if params:
         param_str = "&".join(f"{k}={v}" for k, v in params.items())
         url = f"{url}?{param_str}"
-
+    return url
+
+
+def canvas_send(method, url, headers, body=None):
+    """
+    Send a rate-limited request and return the HTTPResult.
+
+    Throttled (403/429) requests are retried with jittered exponential
+    backoff, and so are server errors (5xx) and connection failures of
+    idempotent (GET/HEAD) requests; CanvasAPIError is raised if they
+    persist. A POST that may already have been carried out (e.g. the one
+    creating a quiz report) is not sent again.
+    """
+    for attempt in range(_max_retries + 1):
+        _rate_limiter.acquire()
+        retry_after = None
+        throttled = False
+        try:
+            result = _connection_pool.request(method, url, headers, body)
+        except (http.client.HTTPException, OSError) as e:
+            error = f"URL Error: {e}"
+            result = None
+        finally:
+            _rate_limiter.release()
+
+        if result is not None:
+            _rate_limiter.update(result.headers)
+            if is_throttled(result):
+                _rate_limiter.throttled()
+                throttled = True
+                error = f"Rate limited (HTTP {result.status})"
+                retry_after = result.headers.get("Retry-After")
+            elif result.status >= 500:
+                error = f"HTTP Error {result.status}: {result.reason}"
+            else:
+                return result
+
+        if not throttled and method not in ConnectionPool.IDEMPOTENT_METHODS:
+            raise CanvasAPIError(f"{error} (not retried): {method} {url}")
+        if attempt < _max_retries:
+            time.sleep(backoff_delay(attempt, retry_after))
+
+    raise CanvasAPIError(f"{error} after {_max_retries + 1} attempts: {url}")
+
+
+def canvas_api_get(url, token, conditional=True):
+    """
+    GET a Canvas API URL and return (data, headers).
+
+    Transient failures are retried by canvas_send. Other errors are printed
+    and return (None, None). With conditional=False the cache is not
+    consulted (the response is still stored).
+    """
     headers = {"Authorization": f"Bearer {token}"}
-    request = Request(url, headers=headers)
 
-    try:
-        with urlopen(request) as response:
-            return json.loads(response.read().decode())
-    except HTTPError as e:
-        print(f"HTTP Error {e.code}: {e.reason}")
-        print(f"URL: {url}")
-        return None
-    except URLError as e:
-        print(f"URL Error: {e.reason}")
+    cached = _response_cache.get(url) if _response_cache and conditional else None
+    if cached:
+        headers.update(_response_cache.conditional_headers(cached))
+
+    result = canvas_send("GET", url, headers)
+
+    if result.status == 304 and not (cached and cached.get("body")):
+        # Nothing to serve (e.g. the entry was evicted or unreadable), so
+        # fetch the full response instead
+        headers = {"Authorization": f"Bearer {token}"}
+        cached = None
+        result = canvas_send("GET", url, headers)
+
+    if result.status == 304 and cached:
+        _response_cache.hits += 1
+        # The 304's own headers are current. ETags that only hash the body
+        # match while a list grows, so a cached Link may be out of date.
+        cached_headers = http.client.HTTPMessage()
+        for key, value in cached["headers"].items():
+            cached_headers[key] = value
+        for key in set(result.headers.keys()):
+            del cached_headers[key]
+            for value in result.headers.get_all(key):
+                cached_headers[key] = value
+        if "Link" not in result.headers and "Link" in cached_headers:
+            cached_headers[CACHED_LINK_HEADER] = "1"
+        return json.loads(cached["body"]), cached_headers
+
+    if result.status >= 300:
+        log(f"HTTP Error {result.status}: {result.reason}")
+        log(f"URL: {url}")
+        return None, None
+
+    if _response_cache:
+        _response_cache.put(url, result.headers, result.body)
+
+    return json.loads(result.body.decode()), result.headers
+
+
+def canvas_api_post(base_url, endpoint, token, params):
+    """POST form parameters (a list of key/value pairs) to the Canvas API."""
+    url = build_api_url(base_url, endpoint)
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/x-www-form-urlencoded"
+    }
+    result = canvas_send("POST", url, headers, urlencode(params).encode())
+
+    if result.status >= 400:
+        log(f"HTTP Error {result.status}: {result.reason}")
+        log(f"URL: {url}")
         return None
 
+    return json.loads(result.body.decode())
 
-def canvas_api_paginated(base_url, endpoint, token, params=None):
-    """Handle paginated Canvas API responses."""
-    all_results = []
-    page = 1
-    per_page = 100
 
+def canvas_api_request(base_url, endpoint, token, params=None):
+    """Make a request to the Canvas API."""
+    data, _ = canvas_api_get(build_api_url(base_url, endpoint, params), token)
+    return data
+
+
+def parse_link_header(value):
+    """Parse a Link header into {rel: url}."""
+    links = {}
+    for part in (value or "").split(","):
+        match = re.match(r'\s*<([^>]*)>\s*;.*?rel="?([^";]+)"?', part)
+        if match:
+            links[match.group(2)] = match.group(1)
+    return links
+
+
+def page_number(url):
+    """Return the numeric page parameter of a URL, or None (e.g. bookmarks)."""
+    match = re.search(r"[?&]page=(\d+)(?:&|$)", url or "")
+    return int(match.group(1)) if match else None
+
+
+def page_length(page):
+    """Number of records in a page (list, or dict of lists)."""
+    if isinstance(page, dict):
+        return max((len(v) for v in page.values() if isinstance(v, list)), default=0)
+    return len(page)
+
+
+def merge_pages(pages):
+    """
+    Combine pages into one result.
+
+    Most endpoints return lists; some (e.g. quiz submissions) return a dict
+    such as {"quiz_submissions": [...]}, whose lists are concatenated by key.
+    """
+    if not pages:
+        return []
+    if not isinstance(pages[0], dict):
+        merged = []
+        for page in pages:
+            merged.extend(page)
+        return merged
+
+    merged = {}
+    for page in pages:
+        for key, value in page.items():
+            if isinstance(value, list):
+                merged.setdefault(key, []).extend(value)
+            else:
+                merged.setdefault(key, value)
+    return merged
+
+
+def canvas_api_paginated(base_url, endpoint, token, params=None, max_workers=1):
+    """
+    Handle paginated Canvas API responses.
+
+    Follows the Link header: when rel="last" gives a page number, the
+    remaining pages are fetched in parallel; otherwise rel="next" is followed.
+    Without a Link header, pages are walked until one comes back short.
+    A Link header served from the cache may predate pages added since, so
+    its rel="last" is ignored, and a full page it gives no rel="next" for
+    is fetched again unconditionally for a current Link header.
+
+    Raises CanvasAPIError if a page after the first cannot be fetched,
+    rather than silently returning truncated results.
+    """
+    per_page = 100
+    page_params = {"page": 1, "per_page": per_page}
+    if params:
+        page_params.update(params)
+
+    url = build_api_url(base_url, endpoint, page_params)
+    first, headers = canvas_api_get(url, token)
+    if not first:
+        return []
+
+    pages = [first]
+    links = parse_link_header(headers.get("Link"))
+    if headers.get(CACHED_LINK_HEADER):
+        links.pop("last", None)
+
+    if not links:
+        # No Link header: keep requesting until a short page
+        while page_length(pages[-1]) >= per_page:
+            page_params["page"] += 1
+            results = canvas_api_request(base_url, endpoint, token, page_params)
+            if results is None:
+                raise CanvasAPIError(f"Page {page_params['page']} of {endpoint} failed")
+            if not results:
+                break
+            pages.append(results)
+        return merge_pages(pages)
+
+    last_page = page_number(links.get("last"))
+    if last_page and last_page > 1 and "next" in links:
+        # Total page count is known: prefetch the rest in parallel
+        last_url = links["last"]
+        urls = [
+            re.sub(r"([?&])page=\d+", rf"\g<1>page={n}", last_url)
+            for n in range(2, last_page + 1)
+        ]
+
+        def fetch_page(url):
+            return canvas_api_get(url, token)[0]
+
+        if max_workers > 1 and len(urls) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+                results = list(pool.map(fetch_page, urls))
+        else:
+            results = [fetch_page(url) for url in urls]
+
+        for n, page in enumerate(results, start=2):
+            if page is None:
+                raise CanvasAPIError(f"Page {n} of {endpoint} failed")
+            pages.append(page)
+        return merge_pages(pages)
+
+    # Opaque (bookmark) pagination, or a cached Link: follow rel="next"
     while True:
-        page_params = {"page": page, "per_page": per_page}
-        if params:
-            page_params.update(params)
-
-        results = canvas_api_request(base_url, endpoint, token, page_params)
-        if not results:
-            break
-
-        all_results.extend(results)
+        if "next" not in links:
+            if not (headers.get(CACHED_LINK_HEADER) and page_length(pages[-1]) >= per_page):
+                break
+            results, headers = canvas_api_get(url, token, conditional=False)
+            if results is None:
+                raise CanvasAPIError(f"Page {len(pages)} of {endpoint} failed")
+            pages[-1] = results
+            links = parse_link_header(headers.get("Link"))
+            continue
 
-        if len(results) < per_page:
-            break
-        page += 1
+        url = links["next"]
+        results, headers = canvas_api_get(url, token)
+        if results is None:
+            raise CanvasAPIError(f"Page {len(pages) + 1} of {endpoint} failed")
+        pages.append(results)
+        links = parse_link_header(headers.get("Link"))
 
-    return all_results
+    return merge_pages(pages)
 
 
-def fetch_quizzes(base_url, course_id, token):
+def fetch_quizzes(base_url, course_id, token, max_workers=1):
     """Fetch all quizzes for a course."""
-    print(f"  Fetching quizzes for course {course_id}...")
+    log(f"  Fetching quizzes for course {course_id}...")
     endpoint = f"/courses/{course_id}/quizzes"
-    quizzes = canvas_api_paginated(base_url, endpoint, token)
+    quizzes = canvas_api_paginated(base_url, endpoint, token, max_workers=max_workers)
 
     if quizzes:
-        print(f"    Found {len(quizzes)} quizzes")
+        log(f"    Found {len(quizzes)} quizzes")
     return quizzes or []
 
 
-def fetch_quiz_questions(base_url, course_id, quiz_id, token):
+def fetch_quiz_questions(base_url, course_id, quiz_id, token, max_workers=1):
     """Fetch questions for a specific quiz."""
     endpoint = f"/courses/{course_id}/quizzes/{quiz_id}/questions"
-    return canvas_api_paginated(base_url, endpoint, token) or []
+    return canvas_api_paginated(base_url, endpoint, token, max_workers=max_workers) or []
 
 
-def fetch_quiz_submissions(base_url, course_id, quiz_id, token):
+def fetch_quiz_submissions(base_url, course_id, quiz_id, token, max_workers=1):
     """Fetch all submissions for a quiz."""
     endpoint = f"/courses/{course_id}/quizzes/{quiz_id}/submissions"
     params = {"include[]": "submission"}
-    return canvas_api_paginated(base_url, endpoint, token, params) or []
+    return canvas_api_paginated(base_url, endpoint, token, params, max_workers) or []
 
 
 def fetch_submission_questions(base_url, course_id, quiz_id, submission_id, token):
@@ -149,15 +764,15 @@ def fetch_submission_questions(base_url, course_id, quiz_id, submission_id, toke
     return canvas_api_request(base_url, endpoint, token) or []
 
 
-def fetch_enrollments(base_url, course_id, token):
+def fetch_enrollments(base_url, course_id, token, max_workers=1):
     """Fetch all student enrollments with final grades."""
-    print(f"  Fetching enrollments for course {course_id}...")
+    log(f"  Fetching enrollments for course {course_id}...")
     endpoint = f"/courses/{course_id}/enrollments"
     params = {"type[]": "StudentEnrollment", "state[]": "active"}
-    enrollments = canvas_api_paginated(base_url, endpoint, token, params)
+    enrollments = canvas_api_paginated(base_url, endpoint, token, params, max_workers)
 
     if enrollments:
-        print(f"    Found {len(enrollments)} students")
+        log(f"    Found {len(enrollments)} students")
     return enrollments or []
 
 
@@ -168,14 +783,377 @@ def anonymize_id(student_id, id_map):
     return id_map[student_id]
 
 
-def process_quiz_data(base_url, course_id, quiz, token, id_map):
-    """Process a single quiz and extract question-level responses."""
-    quiz_id = quiz["id"]
-    print(f"    Processing quiz: {quiz.get('title', quiz_id)}")
+def restore_id_map(saved):
+    """Restore integer Canvas user IDs in an ID map loaded from JSON."""
+    # JSON object keys are always strings; Canvas user IDs are integers
+    return {int(k) if k.isdigit() else k: v for k, v in saved.items()}
 
-    # Fetch questions
-    questions = fetch_quiz_questions(base_url, course_id, quiz_id, token)
 
+def load_id_map(output_dir):
+    """Load a saved anonymization map."""
+    id_map_file = output_dir / "id_mapping.json"
+    if not id_map_file.exists():
+        return {}
+
+    with open(id_map_file) as f:
+        return restore_id_map(json.load(f))
+
+
+class FetchCheckpoint:
+    """
+    Append-only journal of a section fetch, used by --resume.
+
+    Records the ID map whenever it grows, each submission's responses as
+    they arrive, and each quiz once its quiz_<id>.json is written. One
+    JSON event per line, flushed immediately, so an interrupted fetch
+    loses at most the line being written. The journal is deleted when the
+    section completes.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.id_map = {}
+        self.completed_quizzes = set()
+        self.submissions = {}  # quiz_id -> {submission_id: responses}
+        self.resumed = resume and path.exists()
+        if self.resumed:
+            self._replay()
+
+        self._id_map_size = len(self.id_map)
+        self._lock = threading.Lock()
+        self._file = open(path, "a" if self.resumed else "w")
+
+    def _replay(self):
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    break  # Line cut off by the interruption
+
+                if event["event"] == "id_map":
+                    self.id_map = restore_id_map(event["id_map"])
+                elif event["event"] == "submission":
+                    quiz_subs = self.submissions.setdefault(event["quiz_id"], {})
+                    quiz_subs[event["submission_id"]] = event["responses"]
+                elif event["event"] == "quiz":
+                    self.completed_quizzes.add(event["quiz_id"])
+                    self.submissions.pop(event["quiz_id"], None)
+
+    def _write(self, event):
+        with self._lock:
+            self._file.write(json.dumps(event) + "\n")
+            self._file.flush()
+
+    def record_id_map(self, id_map):
+        """Record the ID map if new students were added."""
+        if len(id_map) != self._id_map_size:
+            self._id_map_size = len(id_map)
+            self._write({"event": "id_map", "id_map": id_map})
+
+    def record_submission(self, quiz_id, submission_id, responses):
+        self._write({"event": "submission", "quiz_id": quiz_id,
+                     "submission_id": submission_id, "responses": responses})
+
+    def record_quiz(self, quiz_id):
+        self._write({"event": "quiz", "quiz_id": quiz_id})
+        self.submissions.pop(quiz_id, None)
+
+    def saved_responses(self, quiz_id):
+        """Responses already fetched for an interrupted quiz, by submission ID."""
+        return self.submissions.get(quiz_id, {})
+
+    def finish(self):
+        """Close and delete the journal after a complete fetch."""
+        self._file.close()
+        self.path.unlink(missing_ok=True)
+
+    def close(self):
+        self._file.close()
+
+
+class RunCheckpoint:
+    """
+    Journal of the sections an --all fetch has completed, used by --resume.
+
+    Each section's per-section journal is deleted when it completes, so
+    this records the completed sections (one JSON line each, with the
+    section's summary) for a resumed run to skip. The journal is deleted
+    once every section of the run has succeeded.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.completed = {}  # section key -> summary
+        if resume and path.exists():
+            with open(path) as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        break  # Line cut off by the interruption
+                    self.completed[event["section"]] = event["summary"]
+
+        self._lock = threading.Lock()
+        self._file = open(path, "a" if self.completed else "w")
+
+    def record_section(self, section_key, summary):
+        with self._lock:
+            self._file.write(json.dumps({"section": section_key, "summary": summary}) + "\n")
+            self._file.flush()
+
+    def finish(self):
+        """Close and delete the journal after every section succeeded."""
+        self._file.close()
+        self.path.unlink(missing_ok=True)
+
+    def close(self):
+        self._file.close()
+
+
+class PreviousQuizzes:
+    """
+    Lazily loads previously fetched quiz data by quiz ID.
+
+    Per-quiz files are written as each quiz finishes, so they take
+    precedence, then quizzes recovered from an interrupted fetch's
+    all_quizzes.json.partial; all_quizzes.json is only parsed if neither
+    has the quiz. Only one quiz is held in memory at a time otherwise.
+    """
+
+    def __init__(self, output_dir, recovered=None):
+        self.output_dir = output_dir
+        self.recovered = recovered or {}
+        self._combined = None
+
+    def get(self, quiz_id):
+        quiz_file = self.output_dir / f"quiz_{quiz_id}.json"
+        if quiz_file.exists():
+            with open(quiz_file) as f:
+                return json.load(f)
+        if quiz_id in self.recovered:
+            return self.recovered[quiz_id]
+
+        if self._combined is None:
+            self._combined = {}
+            combined_file = self.output_dir / "all_quizzes.json"
+            if combined_file.exists():
+                with open(combined_file) as f:
+                    for quiz_data in json.load(f).get("quizzes", []):
+                        self._combined[quiz_data["quiz_id"]] = quiz_data
+        return self._combined.get(quiz_id)
+
+
+def parse_timestamp(value):
+    """Parse a Canvas (UTC, "Z") or local ISO timestamp into an aware datetime."""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.astimezone()  # fetched_at is written in local time
+    return parsed
+
+
+def is_unchanged_submission(sub, previous_sub, previous_fetched_at):
+    """
+    Check whether a submission's stored responses are still current.
+
+    A regrade changes the score without changing finished_at, so the
+    score, kept score and attempt have to match the stored copy too.
+    """
+    if previous_sub is None or not previous_sub.get("responses"):
+        return False
+    if sub.get("finished_at") != previous_sub.get("submitted_at"):
+        return False
+    score = sub.get("score", 0)
+    if (score, sub.get("kept_score", score), sub.get("attempt", 1)) != (
+            previous_sub.get("score"), previous_sub.get("kept_score"), previous_sub.get("attempt")):
+        return False
+
+    finished = parse_timestamp(sub.get("finished_at"))
+    fetched = parse_timestamp(previous_fetched_at)
+    if finished is None or fetched is None:
+        return False
+    return finished <= fetched
+
+
+def get_max_workers(config):
+    """Get the configured number of concurrent fetch workers."""
+    workers = config.get("fetch", {}).get("max_workers", DEFAULT_MAX_WORKERS)
+    return max(1, int(workers))
+
+
+def get_section_workers(config):
+    """Get the number of sections fetched concurrently by --all."""
+    workers = config.get("fetch", {}).get("section_workers", DEFAULT_SECTION_WORKERS)
+    return max(1, int(workers))
+
+
+def get_fetch_strategy(config):
+    """Get the configured response collection strategy."""
+    strategy = config.get("fetch", {}).get("strategy", "submissions")
+    if strategy not in FETCH_STRATEGIES:
+        log(f"Error: Unknown fetch strategy '{strategy}'")
+        log(f"Available strategies: {list(FETCH_STRATEGIES)}")
+        sys.exit(1)
+    return strategy
+
+
+def fetch_submission_responses(base_url, course_id, quiz_id, submission_id, token):
+    """Fetch question-level responses for a submission as {question_id: response}."""
+    responses = {}
+    try:
+        q_responses = fetch_submission_questions(
+            base_url, course_id, quiz_id, submission_id, token
+        )
+        if q_responses and "quiz_submission_questions" in q_responses:
+            for qr in q_responses["quiz_submission_questions"]:
+                q_id = qr.get("id")
+                # Get the answer ID they selected
+                answer_id = qr.get("answer_id")
+                correct = qr.get("correct", False)
+                responses[str(q_id)] = {
+                    "answer_id": answer_id,
+                    "correct": correct
+                }
+    except CanvasAPIError:
+        raise  # Don't record a throttled request as "no responses"
+    except Exception as e:
+        # Question-level data may not be available
+        pass
+    return responses
+
+
+def normalize_answer_text(text):
+    """Normalize answer text (HTML, entities, whitespace) for matching."""
+    text = html.unescape(re.sub(r"<[^>]+>", " ", text or ""))
+    return " ".join(text.split()).lower()
+
+
+def parse_student_analysis(csv_text, question_data):
+    """
+    Convert a student_analysis report CSV into responses.
+
+    Returns {(user_id, attempt): {question_id: response}} in the same
+    response format as fetch_submission_responses. Each question appears
+    as a "<question_id>: <text>" column holding the chosen answer text,
+    followed by a column with the points earned.
+    """
+    rows = csv.reader(io.StringIO(csv_text))
+    header = next(rows, [])
+    if "id" not in header:
+        return {}
+
+    questions_by_id = {str(q["id"]): q for q in question_data}
+    answer_ids = {
+        q_id: {normalize_answer_text(a["text"]): a["id"] for a in q.get("answers", [])}
+        for q_id, q in questions_by_id.items()
+    }
+
+    question_columns = []
+    for i, name in enumerate(header):
+        match = re.match(r"^(\d+):", name)
+        if match and match.group(1) in questions_by_id:
+            question_columns.append((i, match.group(1)))
+
+    id_col = header.index("id")
+    attempt_col = header.index("attempt") if "attempt" in header else None
+
+    results = {}
+    for row in rows:
+        try:
+            user_id = int(row[id_col])
+            attempt = int(row[attempt_col]) if attempt_col is not None else 1
+        except (IndexError, ValueError):
+            continue
+
+        responses = {}
+        for i, q_id in question_columns:
+            answer_text = row[i] if i < len(row) else ""
+            try:
+                earned = float(row[i + 1])
+            except (IndexError, ValueError):
+                earned = 0.0
+            possible = float(questions_by_id[q_id].get("points") or 0)
+            responses[q_id] = {
+                "answer_id": answer_ids[q_id].get(normalize_answer_text(answer_text)),
+                "correct": earned > 0 and earned >= possible
+            }
+        results[(user_id, attempt)] = responses
+
+    return results
+
+
+def fetch_quiz_report_responses(base_url, course_id, quiz_id, question_data, token):
+    """
+    Collect every submission's responses from one student_analysis report.
+
+    Requests the report, polls its progress until Canvas has generated it,
+    and downloads the CSV. Returns {(user_id, attempt): responses}, or None
+    if the report is unavailable (callers fall back to per-submission calls).
+    """
+    endpoint = f"/courses/{course_id}/quizzes/{quiz_id}/reports"
+    try:
+        report = canvas_api_post(base_url, endpoint, token, [
+            ("quiz_report[report_type]", "student_analysis"),
+            ("quiz_report[includes_all_versions]", "true"),
+            ("include[]", "file"),
+            ("include[]", "progress")
+        ])
+    except CanvasAPIError as e:
+        # Not retried, since Canvas may have created the report anyway
+        log(f"      {e}")
+        report = None
+    if report is None:
+        # 409: a report is already being generated (or the request above
+        # failed after creating one); look it up instead
+        existing = canvas_api_request(
+            base_url, endpoint, token, {"includes_all_versions": "true"}
+        ) or []
+        report = next((r for r in existing
+                       if r.get("report_type") == "student_analysis"), None)
+        if report is None:
+            return None
+
+    # Wait for generation to finish
+    deadline = time.monotonic() + REPORT_TIMEOUT
+    delay = 1.0
+    while not report.get("file"):
+        progress_url = report.get("progress_url")
+        if not progress_url or time.monotonic() > deadline:
+            return None
+
+        time.sleep(delay)
+        delay = min(delay * 2, 10.0)
+        progress, _ = canvas_api_get(progress_url, token)
+        if not progress or progress.get("workflow_state") == "failed":
+            return None
+        if progress.get("workflow_state") == "completed":
+            report = canvas_api_request(
+                base_url, f"{endpoint}/{report['id']}", token, {"include[]": "file"}
+            ) or {}
+            if not report.get("file"):
+                return None
+
+    # Report files are served from Canvas (or its file storage) by URL
+    file_url = report["file"].get("url")
+    if not file_url:
+        return None
+    headers = {}
+    if urlsplit(file_url).netloc == urlsplit(base_url).netloc:
+        headers["Authorization"] = f"Bearer {token}"
+    result = canvas_send("GET", file_url, headers)
+    if result.status >= 400:
+        log(f"HTTP Error {result.status}: {result.reason}")
+        log(f"URL: {file_url}")
+        return None
+
+    return parse_student_analysis(result.body.decode("utf-8-sig"), question_data)
+
+
+def build_question_data(questions):
+    """Extract question definitions and answer options, sorted by position."""
     # Build question lookup
     question_data = []
     for q in questions:
@@ -200,9 +1178,45 @@ def process_quiz_data(base_url, course_id, quiz, token, id_map):
 
     # Sort by position
     question_data.sort(key=lambda x: x["position"])
+    return question_data
+
+
+def process_quiz_data(base_url, course_id, quiz, token, id_map, max_workers=1,
+                      previous=None, strategy="submissions", checkpoint=None):
+    """
+    Process a single quiz and extract question-level responses.
+
+    If previous data for the quiz is given (incremental mode), responses
+    are only fetched for submissions that are new, finished after the
+    previous fetched_at, or regraded. Questions are always fetched (cheap
+    with the response cache), and if they changed (e.g. a fixed answer
+    key) every submission's responses are fetched again.
+
+    With strategy="quiz_report", responses come from one student_analysis
+    report per quiz; submissions missing from the report (or all of them,
+    if the report fails) fall back to per-submission requests.
+
+    With a checkpoint, fetched responses are journaled as they arrive and
+    responses saved by an interrupted run are reused.
+    """
+    quiz_id = quiz["id"]
+    log(f"    Processing quiz: {quiz.get('title', quiz_id)}")
+
+    # Fetch questions
+    questions = fetch_quiz_questions(base_url, course_id, quiz_id, token, max_workers)
+    question_data = build_question_data(questions)
+
+    previous_subs = {}
+    if previous is not None and previous.get("questions") == question_data:
+        for prev_sub in previous.get("submissions", []):
+            previous_subs[(prev_sub["student_id"], prev_sub.get("attempt"))] = prev_sub
+    elif previous is not None:
+        log("      Questions changed since the last fetch; fetching all responses")
 
     # Fetch submissions
-    submissions_raw = fetch_quiz_submissions(base_url, course_id, quiz_id, token)
+    submissions_raw = fetch_quiz_submissions(
+        base_url, course_id, quiz_id, token, max_workers
+    )
 
     # Extract submissions list from various possible response formats
     submissions_list = []
@@ -213,7 +1227,11 @@ def process_quiz_data(base_url, course_id, quiz, token, id_map):
     elif isinstance(submissions_raw, list):
         submissions_list = submissions_raw
 
+    # Build submission records in Canvas order first, so anonymous IDs are
+    # assigned deterministically regardless of which response fetch finishes first
+    saved_responses = checkpoint.saved_responses(quiz_id) if checkpoint else {}
     submissions = []
+    pending = []
     for sub in submissions_list:
         # Skip non-dict elements (Canvas sometimes includes metadata strings)
         if not isinstance(sub, dict):
@@ -231,29 +1249,65 @@ def process_quiz_data(base_url, course_id, quiz, token, id_map):
             "responses": {}
         }
 
-        # Try to get question-level responses
+        submissions.append(sub_data)
+
+        prev_sub = previous_subs.get((sub_data["student_id"], sub_data["attempt"]))
+        if previous is not None and is_unchanged_submission(
+                sub, prev_sub, previous.get("fetched_at")):
+            sub_data["responses"] = prev_sub["responses"]
+            continue
+
+        if sub.get("id") in saved_responses:
+            sub_data["responses"] = saved_responses[sub["id"]]
+            continue
+
+        # Question-level responses are fetched below
         # Note: This requires quiz to have "show student quiz responses" enabled
-        submission_id = sub.get("id")
-        if submission_id:
-            try:
-                q_responses = fetch_submission_questions(
-                    base_url, course_id, quiz_id, submission_id, token
-                )
-                if q_responses and "quiz_submission_questions" in q_responses:
-                    for qr in q_responses["quiz_submission_questions"]:
-                        q_id = qr.get("id")
-                        # Get the answer ID they selected
-                        answer_id = qr.get("answer_id")
-                        correct = qr.get("correct", False)
-                        sub_data["responses"][str(q_id)] = {
-                            "answer_id": answer_id,
-                            "correct": correct
-                        }
-            except Exception as e:
-                # Question-level data may not be available
-                pass
+        if sub.get("id"):
+            pending.append((sub_data, sub))
+
+    if previous is not None:
+        log(f"      {len(submissions) - len(pending)} unchanged, "
+            f"{len(pending)} new or updated submissions")
+    if saved_responses:
+        log(f"      Resumed {len(saved_responses)} submissions from checkpoint")
+    if checkpoint:
+        checkpoint.record_id_map(id_map)
+
+    if strategy == "quiz_report" and pending:
+        report = fetch_quiz_report_responses(
+            base_url, course_id, quiz_id, question_data, token
+        )
+        if report is None:
+            log("      Quiz report unavailable; fetching submissions individually")
+            report = {}
+
+        unmatched = []
+        for sub_data, sub in pending:
+            responses = report.get((sub["user_id"], sub_data["attempt"]))
+            if responses is None:
+                unmatched.append((sub_data, sub))
+            else:
+                sub_data["responses"] = responses
+        pending = unmatched
+
+    def fetch_responses(item):
+        responses = fetch_submission_responses(
+            base_url, course_id, quiz_id, item[1]["id"], token
+        )
+        if checkpoint:
+            checkpoint.record_submission(quiz_id, item[1]["id"], responses)
+        return responses
+
+    # One request per submission; run them concurrently when configured
+    if max_workers > 1 and len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+            results = list(pool.map(fetch_responses, pending))
+    else:
+        results = [fetch_responses(item) for item in pending]
 
-        submissions.append(sub_data)
+    for (sub_data, _), responses in zip(pending, results):
+        sub_data["responses"] = responses
 
     return {
         "quiz_id": quiz_id,
@@ -267,89 +1321,241 @@ def process_quiz_data(base_url, course_id, quiz, token, id_map):
     }
 
 
-def fetch_section_data(section_key, config, grades_only=False):
-    """Fetch all quiz data for a section."""
+def fetch_section_data(section_key, config, grades_only=False, incremental=False,
+                       resume=False):
+    """
+    Fetch all quiz data for a section and return a summary of what was fetched.
+
+    With incremental=True, previously saved quiz data and the saved ID map
+    are reused, and only new or updated submissions are re-fetched.
+
+    Progress is journaled to fetch_checkpoint.jsonl; with resume=True an
+    interrupted fetch continues from it, reusing completed quizzes,
+    already fetched submissions and the ID map. Quizzes the interrupted
+    fetch had already added to all_quizzes.json.partial are recovered from
+    it (with resume or incremental) if their quiz_<id>.json is missing.
+    """
     if section_key not in config["courses"]:
-        print(f"Error: Unknown section '{section_key}'")
-        print(f"Available sections: {list(config['courses'].keys())}")
+        log(f"Error: Unknown section '{section_key}'")
+        log(f"Available sections: {list(config['courses'].keys())}")
         sys.exit(1)
 
     course_config = config["courses"][section_key]
     course_id = course_config["course_id"]
     base_url = config["canvas"]["base_url"]
     token = get_canvas_token()
+    start = time.monotonic()
 
-    print(f"\nFetching data for {section_key} (Course ID: {course_id})")
+    log(f"\nFetching data for {section_key} (Course ID: {course_id})")
 
     # Create output directory
     output_dir = Path(__file__).parent.parent / config["paths"]["raw_data"] / section_key
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # ID mapping for anonymization
-    id_map = {}
-
-    # Fetch enrollments/grades
-    enrollments = fetch_enrollments(base_url, course_id, token)
-    grades_data = []
-    for enrollment in enrollments:
-        user_id = enrollment.get("user_id")
-        if user_id:
-            grades_data.append({
-                "student_id": anonymize_id(user_id, id_map),
-                "current_score": enrollment.get("grades", {}).get("current_score"),
-                "final_score": enrollment.get("grades", {}).get("final_score"),
-                "current_grade": enrollment.get("grades", {}).get("current_grade"),
-                "final_grade": enrollment.get("grades", {}).get("final_grade")
-            })
-
-    # Save grades
-    grades_file = output_dir / "grades.json"
-    with open(grades_file, "w") as f:
-        json.dump({
-            "section": section_key,
-            "course_id": course_id,
-            "fetched_at": datetime.now().isoformat(),
-            "enrollments": grades_data
-        }, f, indent=2)
-    print(f"  Saved grades to {grades_file}")
-
-    if grades_only:
-        return
-
-    # Fetch quizzes
-    quizzes = fetch_quizzes(base_url, course_id, token)
+    checkpoint = None
+    if not grades_only:
+        checkpoint = FetchCheckpoint(output_dir / "fetch_checkpoint.jsonl", resume)
+        if checkpoint.resumed:
+            log(f"  Resuming: {len(checkpoint.completed_quizzes)} quizzes already complete")
 
-    # Process each quiz
-    all_quiz_data = []
-    for quiz in quizzes:
-        if not quiz.get("published", False):
-            continue  # Skip unpublished quizzes
-
-        quiz_data = process_quiz_data(base_url, course_id, quiz, token, id_map)
-        all_quiz_data.append(quiz_data)
-
-        # Save individual quiz data
-        quiz_file = output_dir / f"quiz_{quiz['id']}.json"
-        with open(quiz_file, "w") as f:
-            json.dump(quiz_data, f, indent=2)
-
-    # Save combined data
-    combined_file = output_dir / "all_quizzes.json"
-    with open(combined_file, "w") as f:
-        json.dump({
+    # The journal and the streamed output files are closed if the fetch
+    # fails; the journal and all_quizzes.json.partial are kept for --resume
+    writer = store_writer = None
+    try:
+        # ID mapping for anonymization (kept stable across incremental runs)
+        if checkpoint and checkpoint.id_map:
+            id_map = checkpoint.id_map
+        else:
+            id_map = load_id_map(output_dir) if incremental else {}
+        recovered = {}
+        if not grades_only and (resume or incremental):
+            recovered = recover_quizzes(output_dir / "all_quizzes.json")
+        previous_quizzes = PreviousQuizzes(output_dir, recovered) if incremental else None
+        max_workers = get_max_workers(config)
+        strategy = get_fetch_strategy(config)
+
+        # Fetch enrollments/grades
+        enrollments = fetch_enrollments(base_url, course_id, token, max_workers)
+        grades_data = []
+        for enrollment in enrollments:
+            user_id = enrollment.get("user_id")
+            if user_id:
+                grades_data.append({
+                    "student_id": anonymize_id(user_id, id_map),
+                    "current_score": enrollment.get("grades", {}).get("current_score"),
+                    "final_score": enrollment.get("grades", {}).get("final_score"),
+                    "current_grade": enrollment.get("grades", {}).get("current_grade"),
+                    "final_grade": enrollment.get("grades", {}).get("final_grade")
+                })
+
+        # Save grades
+        grades_file = output_dir / "grades.json"
+        with open(grades_file, "w") as f:
+            json.dump({
+                "section": section_key,
+                "course_id": course_id,
+                "fetched_at": datetime.now().isoformat(),
+                "enrollments": grades_data
+            }, f, indent=2)
+        log(f"  Saved grades to {grades_file}")
+        if checkpoint:
+            checkpoint.record_id_map(id_map)
+
+        summary = {"students": len(grades_data), "quizzes": 0, "submissions": 0}
+
+        if grades_only:
+            summary["elapsed"] = time.monotonic() - start
+            return summary
+
+        # Fetch quizzes (skipping unpublished ones)
+        quizzes = fetch_quizzes(base_url, course_id, token, max_workers)
+        quizzes = [quiz for quiz in quizzes if quiz.get("published", False)]
+
+        # Combined data is streamed to disk as each quiz is processed, both as
+        # all_quizzes.json and as the columnar response store
+        combined_file = output_dir / "all_quizzes.json"
+        header = {
             "section": section_key,
             "course_id": course_id,
             "semester": course_config["semester"],
-            "fetched_at": datetime.now().isoformat(),
-            "quizzes": all_quiz_data
-        }, f, indent=2)
-
-    print(f"\n  Saved {len(all_quiz_data)} quizzes to {output_dir}")
-
-    # Save ID mapping (for reference, also gitignored)
-    id_map_file = output_dir / "id_mapping.json"
-    with open(id_map_file, "w") as f:
-        json.dump(id_map, f, indent=2)
+            "fetched_at": datetime.now().isoformat()
+        }
+        writer = QuizStreamWriter(combined_file, header)
+        store_writer = ResponseStoreWriter(output_dir, header)
+
+        # Process each quiz
+        for quiz in quizzes:
+            quiz_file = output_dir / f"quiz_{quiz['id']}.json"
+
+            if quiz["id"] in checkpoint.completed_quizzes and (
+                    quiz_file.exists() or quiz["id"] in recovered):
+                # Finished before the interruption
+                if quiz_file.exists():
+                    with open(quiz_file) as f:
+                        quiz_json = f.read()
+                else:
+                    quiz_json = json.dumps(recovered[quiz["id"]], indent=2)
+                    with open(quiz_file, "w") as f:
+                        f.write(quiz_json)
+                quiz_data = json.loads(quiz_json)
+                summary["submissions"] += len(quiz_data["submissions"])
+                writer.write_quiz(quiz_json)
+                store_writer.write_quiz(quiz_data)
+                continue
+
+            previous = previous_quizzes.get(quiz["id"]) if incremental else None
+            quiz_data = process_quiz_data(
+                base_url, course_id, quiz, token, id_map, max_workers,
+                previous=previous, strategy=strategy, checkpoint=checkpoint
+            )
+            summary["submissions"] += len(quiz_data["submissions"])
+
+            # Save individual quiz data, and append it to the combined file
+            quiz_json = json.dumps(quiz_data, indent=2)
+            with open(quiz_file, "w") as f:
+                f.write(quiz_json)
+            writer.write_quiz(quiz_json)
+            store_writer.write_quiz(quiz_data)
+            checkpoint.record_quiz(quiz["id"])
+
+            log(f"  [{section_key}] {writer.count}/{len(quizzes)} quizzes fetched")
+
+        writer.close()
+        store_writer.close()
+
+        log(f"\n  Saved {writer.count} quizzes to {output_dir}")
+
+        # Save ID mapping (for reference, also gitignored)
+        id_map_file = output_dir / "id_mapping.json"
+        with open(id_map_file, "w") as f:
+            json.dump(id_map, f, indent=2)
+
+        checkpoint.finish()
+
+        summary["quizzes"] = writer.count
+        summary["elapsed"] = time.monotonic() - start
+        return summary
+    except BaseException:
+        if writer:
+            writer.abort()
+        if store_writer:
+            store_writer.abort()
+        if checkpoint:
+            checkpoint.close()
+        raise
+
+
+def fetch_all_sections(config, grades_only=False, incremental=False, resume=False):
+    """
+    Fetch every configured section concurrently.
+
+    Sections are independent Canvas courses, so they run in parallel
+    (fetch.section_workers at a time) while sharing one rate limiter and
+    request budget. A section that fails, for whatever reason, doesn't
+    stop the others.
+
+    Completed sections are recorded in fetch_all_checkpoint.jsonl, so with
+    resume=True the sections an interrupted run finished are skipped.
+    Returns True if every section succeeded.
+    """
+    section_keys = list(config["courses"])
+    start = time.monotonic()
+
+    run_checkpoint = None
+    if not grades_only:
+        raw_dir = Path(__file__).parent.parent / config["paths"]["raw_data"]
+        raw_dir.mkdir(parents=True, exist_ok=True)
+        run_checkpoint = RunCheckpoint(raw_dir / RUN_CHECKPOINT_FILE, resume)
+
+    summaries = {}
+    if run_checkpoint:
+        summaries = {k: v for k, v in run_checkpoint.completed.items() if k in section_keys}
+        for key in summaries:
+            log(f"{key} was completed before the interruption; skipping")
+    skipped = set(summaries)
+    remaining = [key for key in section_keys if key not in summaries]
+    workers = max(1, min(len(remaining), get_section_workers(config)))
+
+    def fetch_section(key):
+        summary = fetch_section_data(key, config, grades_only, incremental, resume)
+        if run_checkpoint:
+            run_checkpoint.record_section(key, summary)
+        return summary
+
+    failures = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {key: pool.submit(fetch_section, key) for key in remaining}
+            for key, future in futures.items():
+                try:
+                    summaries[key] = future.result()
+                except CanvasAPIError as e:
+                    failures[key] = str(e)
+                except Exception as e:
+                    # An unexpected payload or a disk error; KeyboardInterrupt
+                    # and SystemExit still stop the run
+                    failures[key] = f"{type(e).__name__}: {e}"
+                    log(f"\nError fetching {key}: {failures[key]}")
+    finally:
+        if run_checkpoint and (failures or len(summaries) < len(section_keys)):
+            run_checkpoint.close()
+        elif run_checkpoint:
+            run_checkpoint.finish()
+
+    print("\nSummary:")
+    for key in section_keys:
+        if key in summaries:
+            s = summaries[key]
+            when = "before the interruption" if key in skipped else f"{s['elapsed']:.1f}s"
+            print(f"  {key}: {s['quizzes']} quizzes, {s['submissions']} submissions, "
+                  f"{s['students']} students ({when})")
+        else:
+            print(f"  {key}: FAILED - {failures[key]}")
+    print(f"  Total: {sum(s['quizzes'] for s in summaries.values())} quizzes, "
+          f"{sum(s['submissions'] for s in summaries.values())} submissions "
+          f"in {time.monotonic() - start:.1f}s")
+
+    return not failures
 
 
 def main():
@@ -371,6 +1577,27 @@ def main():
         action="store_true",
         help="Fetch only grades (faster, for grade correlation updates)"
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch quizzes and submissions that are new since the last fetch"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted fetch from its checkpoint"
+    )
+    parser.add_argument(
+        "--strategy",
+        choices=FETCH_STRATEGIES,
+        help="How to collect item responses: one request per submission, "
+             "or one quiz report per quiz (overrides fetch.strategy)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk response cache"
+    )
 
     args = parser.parse_args()
 
@@ -379,14 +1606,28 @@ def main():
         sys.exit(1)
 
     config = load_config()
+    if args.strategy:
+        config.setdefault("fetch", {})["strategy"] = args.strategy
+    configure_response_cache(config, enabled=not args.no_cache)
+    configure_rate_limiter(config)
 
     if args.all:
-        for section_key in config["courses"]:
-            fetch_section_data(section_key, config, args.grades)
+        if not fetch_all_sections(config, args.grades, args.incremental, args.resume):
+            _connection_pool.close()
+            print("\nFetch incomplete. Re-run with --resume to continue failed sections.")
+            sys.exit(1)
     else:
-        fetch_section_data(args.section, config, args.grades)
-
+        try:
+            fetch_section_data(args.section, config, args.grades,
+                               args.incremental, args.resume)
+        except CanvasAPIError as e:
+            print(f"\nError: {e}")
+            print("Fetch aborted. Re-run with --resume to continue where it stopped.")
+            sys.exit(1)
+
+    _connection_pool.close()
     print("\nData fetch complete!")
+    print_connection_stats()
 
 
 if __name__ == "__main__":
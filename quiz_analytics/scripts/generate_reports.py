@@ -68,6 +68,13 @@ def format_decimal(value, decimals=2):
     return f"{value:.{decimals}f}"
 
 
+def format_interval(interval, formatter):
+    """Format a bootstrap confidence interval, or an empty string if there is none."""
+    if not interval:
+        return ""
+    return f" [CI {formatter(interval[0])} to {formatter(interval[1])}]"
+
+
 def get_difficulty_label(p):
     """Get descriptive label for difficulty."""
     if p is None:
@@ -117,6 +124,24 @@ def generate_quiz_markdown(quiz_results, section_key, config):
         report.append(f"- **Median:** {summary.get('median_score', 0):.1f}")
         report.append(f"- **Std Dev:** {summary.get('std_dev', 0):.2f}")
         report.append(f"- **Range:** {summary.get('min_score', 0):.0f} - {summary.get('max_score', 0):.0f}")
+        reliability = summary.get("reliability")
+        if reliability:
+            report.append(f"- **Reliability (KR-20):** {format_decimal(reliability.get('kr20'))}")
+        attempts = summary.get("attempts")
+        if attempts:
+            report.append(f"- **Attempts Analyzed:** {attempts.get('policy')} attempt of each of "
+                          f"{attempts.get('students', 0)} students")
+        timing = summary.get("timing")
+        if timing:
+            percentiles = timing.get("percentiles", {})
+            report.append(f"- **Median Time:** {percentiles.get('50', 0) / 60:.1f} min "
+                          f"(middle 50%: {percentiles.get('25', 0) / 60:.1f}-{percentiles.get('75', 0) / 60:.1f} min)")
+            excluded = " (excluded from item statistics)" if timing.get("excluded_from_item_statistics") else ""
+            rapid = timing.get("rapid_guessers", 0)
+            timed = timing.get("timed_submissions", 0)
+            share = f" ({rapid / timed:.1%} of timed submissions)" if timed else ""
+            report.append(f"- **Rapid Guessers:** {rapid}{share}{excluded}")
+            report.append(f"- **Speed vs Accuracy r:** {format_decimal(timing.get('speed_accuracy_r'))}")
     else:
         report.append("*No score data available*")
 
@@ -145,24 +170,33 @@ def generate_quiz_markdown(quiz_results, section_key, config):
         difficulty = q.get("difficulty")
         discrimination = q.get("discrimination", {})
         point_biserial = q.get("point_biserial", {})
+        bootstrap = q.get("bootstrap", {})
 
-        report.append(f"**Difficulty (p):** {format_percentage(difficulty)} ({get_difficulty_label(difficulty)})")
+        report.append(f"**Difficulty (p):** {format_percentage(difficulty)} ({get_difficulty_label(difficulty)})"
+                      f"{format_interval(bootstrap.get('difficulty'), format_percentage)}")
 
         d_value = discrimination.get("D") if discrimination else None
-        report.append(f"**Discrimination (D):** {format_decimal(d_value)} ({get_discrimination_label(d_value)})")
+        report.append(f"**Discrimination (D):** {format_decimal(d_value)} ({get_discrimination_label(d_value)})"
+                      f"{format_interval(bootstrap.get('discrimination'), format_decimal)}")
 
         if discrimination:
             report.append(f"  - Upper 27%: {format_percentage(discrimination.get('p_upper'))}")
             report.append(f"  - Lower 27%: {format_percentage(discrimination.get('p_lower'))}")
 
         r_pb = point_biserial.get("r_pb") if point_biserial else None
-        report.append(f"**Point-Biserial r:** {format_decimal(r_pb)}")
+        report.append(f"**Point-Biserial r:** {format_decimal(r_pb)}"
+                      f"{format_interval(bootstrap.get('point_biserial'), format_decimal)}")
+
+        item_reliability = q.get("reliability")
+        if item_reliability:
+            report.append(f"**Corrected Item-Total r:** {format_decimal(item_reliability.get('corrected_item_total'))}"
+                          f" (KR-20 if deleted: {format_decimal(item_reliability.get('alpha_if_deleted'))})")
 
         # Distractor analysis table
         distractor = q.get("distractor_analysis")
         if distractor and distractor.get("answers"):
-            report.append("\n| Answer | Selected | Rate | Upper 27% | Lower 27% |")
-            report.append("|--------|----------|------|-----------|-----------|")
+            report.append("\n| Answer | Selected | Rate | Upper 27% | Lower 27% | r_pb |")
+            report.append("|--------|----------|------|-----------|-----------|------|")
 
             for ans in distractor.get("answers", []):
                 letter = ans.get("letter", "?")
@@ -170,9 +204,10 @@ def generate_quiz_markdown(quiz_results, section_key, config):
                     letter += "*"
                 count = ans.get("count", 0)
                 rate = format_percentage(ans.get("selection_rate"))
-                # Note: We don't have per-answer upper/lower data in current structure
-                # This would need enhancement in analyze_quiz_performance.py
-                report.append(f"| {letter} | {count} | {rate} | - | - |")
+                upper = format_percentage(ans.get("upper_rate"))
+                lower = format_percentage(ans.get("lower_rate"))
+                r_pb = format_decimal(ans.get("point_biserial"))
+                report.append(f"| {letter} | {count} | {rate} | {upper} | {lower} | {r_pb} |")
 
             report.append("")
 
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Semester-over-semester history of item statistics.
+
+Each analysis run overwrites {section}_analysis.json, so this keeps an
+append-only SQLite index of every question's statistics instead, keyed by
+a fingerprint of the question's text and answers (the same question in a
+later term, section or quiz gets the same fingerprint).
+analyze_quiz_performance.py adds each quiz's results as it analyzes them.
+Each row records the analysis settings it was computed with (attempt
+policy, rapid-guess exclusion, bootstrap, grouping), and items are only
+compared with rows computed the same way.
+
+Usage:
+    python item_history.py item 3f2a9c0d1e5b7a44
+    python item_history.py item 6504905
+    python item_history.py dropped
+    python item_history.py dropped --metric difficulty --by 0.15
+"""
+
+import re
+import sys
+import json
+import sqlite3
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analyze_quiz_performance import (load_config, normalize_text, attempt_policy,
+                                      bootstrap_enabled, get_timing_settings)
+
+HISTORY_FILE = "item_history.sqlite"
+
+METRICS = ("difficulty", "discrimination", "point_biserial", "corrected_item_total")
+SEASONS = {"winter": 0, "spring": 1, "summer": 2, "fall": 3}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    section TEXT NOT NULL,
+    semester TEXT,
+    term_order INTEGER,
+    quiz_id INTEGER,
+    quiz_title TEXT,
+    question_id INTEGER,
+    position INTEGER,
+    question_text TEXT,
+    analyzed_at TEXT NOT NULL,
+    respondents INTEGER,
+    difficulty REAL,
+    discrimination REAL,
+    point_biserial REAL,
+    corrected_item_total REAL,
+    flags INTEGER,
+    settings TEXT
+);
+CREATE INDEX IF NOT EXISTS observations_by_item ON observations (fingerprint, term_order);
+CREATE INDEX IF NOT EXISTS observations_by_question ON observations (section, question_id, id);
+"""
+
+# An item's statistics in its latest analysis for each section and settings
+LATEST = """
+SELECT o.* FROM observations o
+JOIN (SELECT MAX(id) AS id FROM observations GROUP BY fingerprint, section, settings) latest USING (id)
+"""
+
+
+def term_order(semester):
+    """Sortable term number (year * 10 + season) from "Spring 2026" or "spring2026_001"."""
+    text = (semester or "").lower()
+    match = re.search(r"(winter|spring|summer|fall)\s*(\d{4})", text)
+    if match:
+        return int(match.group(2)) * 10 + SEASONS[match.group(1)]
+    match = re.search(r"\d{4}", text)
+    return int(match.group()) * 10 if match else None
+
+
+def analysis_settings(config):
+    """The settings that change an item's statistics, as stored with each row (JSON)."""
+    timing = get_timing_settings(config)
+    return json.dumps({
+        "attempts": attempt_policy(config),
+        "exclude_rapid_guessers": timing["exclude_rapid_guessers"] and timing["rapid_guess_fraction"],
+        "bootstrap": bootstrap_enabled(config),
+        "grouping": config["grouping"]["method"]
+    }, sort_keys=True)
+
+
+class ItemHistory:
+    """
+    Appends quiz results to the item history database.
+
+    A question's statistics are only added when they differ from its
+    previous entry for the same section and analysis settings, so
+    re-running an unchanged analysis does not add rows. All of a run's
+    rows are committed together by close().
+    """
+
+    def __init__(self, path, config):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(observations)")]
+        if "settings" not in columns:
+            # History written before settings were recorded (settings unknown)
+            self.connection.execute("ALTER TABLE observations ADD COLUMN settings TEXT")
+        self.settings = analysis_settings(config)
+
+    def record_quiz(self, section_key, semester, quiz_result, analyzed_at):
+        """Add one quiz's analysis results."""
+        if "error" in quiz_result.get("summary", {}):
+            return
+
+        order = term_order(semester) or term_order(section_key)
+        for q in quiz_result.get("questions", []):
+            discrimination = q.get("discrimination") or {}
+            point_biserial = q.get("point_biserial") or {}
+            reliability = q.get("reliability") or {}
+            distractors = q.get("distractor_analysis") or {}
+            statistics = (
+                distractors.get("total_responses"),
+                q.get("difficulty"),
+                discrimination.get("D"),
+                point_biserial.get("r_pb"),
+                reliability.get("corrected_item_total"),
+                len((q.get("evaluation") or {}).get("flags", []))
+            )
+
+            previous = self.connection.execute(
+                "SELECT fingerprint, respondents, difficulty, discrimination, point_biserial,"
+                " corrected_item_total, flags FROM observations"
+                " WHERE section = ? AND question_id = ? AND settings IS ? ORDER BY id DESC LIMIT 1",
+                (section_key, q["question_id"], self.settings)
+            ).fetchone()
+            if previous == (q["fingerprint"],) + statistics:
+                continue
+
+            self.connection.execute(
+                "INSERT INTO observations (fingerprint, section, semester, term_order, quiz_id,"
+                " quiz_title, question_id, position, question_text, analyzed_at, respondents,"
+                " difficulty, discrimination, point_biserial, corrected_item_total, flags, settings)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (q["fingerprint"], section_key, semester, order, quiz_result.get("quiz_id"),
+                 quiz_result.get("title", ""), q["question_id"], q.get("position", 0),
+                 normalize_text(q.get("text", "")), analyzed_at) + statistics + (self.settings,)
+            )
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+
+def item_terms(connection, item):
+    """
+    Latest statistics of an item (fingerprint or Canvas question ID) in
+    every section, by term, for each analysis settings it was run with.
+    """
+    fingerprints = [item]
+    if item.isdigit():
+        fingerprints = [row[0] for row in connection.execute(
+            "SELECT DISTINCT fingerprint FROM observations WHERE question_id = ?", (int(item),)
+        )]
+    placeholders = ", ".join("?" * len(fingerprints))
+    return connection.execute(
+        f"{LATEST} WHERE o.fingerprint IN ({placeholders}) ORDER BY o.settings, o.term_order, o.section",
+        fingerprints
+    ).fetchall()
+
+
+def dropped_items(connection, metric="discrimination", by=0.1):
+    """
+    Items whose metric fell by at least `by` from one term to the next,
+    using each term's mean over its sections. Only rows computed with the
+    same analysis settings are compared. Largest drops first.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+
+    return connection.execute(f"""
+        WITH latest AS ({LATEST}),
+        terms AS (
+            SELECT fingerprint, settings, term_order, MAX(semester) AS semester,
+                   AVG({metric}) AS value, MAX(question_text) AS question_text
+            FROM latest WHERE {metric} IS NOT NULL
+            GROUP BY fingerprint, settings, term_order
+        ),
+        changes AS (
+            SELECT *, LAG(value) OVER item AS previous, LAG(semester) OVER item AS previous_semester
+            FROM terms
+            WINDOW item AS (PARTITION BY fingerprint, settings ORDER BY term_order)
+        )
+        SELECT fingerprint, settings, previous_semester, previous, semester, value, question_text
+        FROM changes WHERE previous - value >= ?
+        ORDER BY previous - value DESC
+    """, (by,)).fetchall()
+
+
+def format_value(value):
+    return "N/A" if value is None else f"{value:.2f}"
+
+
+def format_settings(settings):
+    """Stored analysis settings as "name=value, ..." ("unknown" for old rows)."""
+    if settings is None:
+        return "unknown settings"
+    return ", ".join(f"{name}={value}" for name, value in json.loads(settings).items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the item statistics history")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    item_parser = commands.add_parser("item", help="Show every term of one item")
+    item_parser.add_argument("item", help="Item fingerprint or Canvas question ID")
+
+    dropped_parser = commands.add_parser("dropped", help="List items whose statistics dropped")
+    dropped_parser.add_argument(
+        "--metric",
+        choices=METRICS,
+        default="discrimination",
+        help="Statistic to compare between terms (default: discrimination)"
+    )
+    dropped_parser.add_argument(
+        "--by",
+        type=float,
+        default=0.1,
+        help="Smallest drop to report (default: 0.1)"
+    )
+
+    args = parser.parse_args()
+    config = load_config()
+    history_file = Path(__file__).parent.parent / config["paths"]["processed"] / HISTORY_FILE
+    if not history_file.exists():
+        print(f"No item history yet ({history_file}). Run analyze_quiz_performance.py first.")
+        sys.exit(1)
+
+    connection = sqlite3.connect(history_file)
+    connection.row_factory = sqlite3.Row
+
+    if args.command == "item":
+        rows = item_terms(connection, args.item)
+        if not rows:
+            print(f"No history for {args.item}")
+            sys.exit(1)
+        print(f"\n{rows[0]['question_text'][:100]}")
+        settings = ()
+        for row in rows:
+            if row["settings"] != settings:
+                settings = row["settings"]
+                print(f"\nAnalyzed with {format_settings(settings)}")
+                print(f"{'Semester':<14} {'Section':<18} {'Quiz':<28} {'n':>4} {'p':>6} {'D':>6} {'r_pb':>6}")
+            print(f"{row['semester'] or '?':<14} {row['section']:<18} {row['quiz_title'][:28]:<28} "
+                  f"{row['respondents'] or 0:>4} {format_value(row['difficulty']):>6} "
+                  f"{format_value(row['discrimination']):>6} {format_value(row['point_biserial']):>6}")
+    else:
+        rows = dropped_items(connection, args.metric, args.by)
+        print(f"\n{len(rows)} items whose {args.metric} dropped by {args.by} or more\n")
+        for row in rows:
+            print(f"{row['fingerprint']}  {row['previous_semester']}: {format_value(row['previous'])}"
+                  f" -> {row['semester']}: {format_value(row['value'])}  {row['question_text'][:60]}"
+                  f"  ({format_settings(row['settings'])})")
+
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Streamed writing and reading of JSON files that hold a list of quizzes.
+
+Used for all_quizzes.json (fetch_canvas_data.py) and <section>_analysis.json
+(analyze_quiz_performance.py), so neither has to build the whole document
+in memory.
+"""
+
+import os
+import json
+from pathlib import Path
+
+
+class QuizStreamWriter:
+    """
+    Writes a {..., "quizzes": [...]} JSON file one quiz at a time.
+
+    The output is identical to json.dump(..., indent=2) of the whole
+    structure, but each quiz is appended (and flushed) as soon as it is
+    processed, so only one quiz needs to be held in memory. Quizzes go to
+    <name>.partial, which close() completes and renames into place, so an
+    interrupted run never leaves a truncated file behind.
+    """
+
+    def __init__(self, path, header):
+        self.path = Path(path)
+        self.partial_path = partial_path(self.path)
+        self.count = 0
+
+        head = json.dumps(dict(header, quizzes=[]), indent=2)
+        self._file = open(self.partial_path, "w")
+        self._file.write(head[:head.rindex("[]")] + "[")
+
+    def write_quiz(self, quiz_json):
+        """Append one quiz, given as its json.dumps(..., indent=2) text."""
+        indented = "\n".join("    " + line for line in quiz_json.split("\n"))
+        self._file.write(("," if self.count else "") + "\n" + indented)
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        """Finish the JSON document and move it into place."""
+        self._file.write("\n  ]\n}" if self.count else "]\n}")
+        self._file.close()
+        os.replace(self.partial_path, self.path)
+
+    def abort(self):
+        """Close the file after a failure, leaving the .partial file for recover_quizzes()."""
+        if not self._file.closed:
+            self._file.close()
+
+
+def iter_streamed_quizzes(path):
+    """
+    Yield the quizzes of a {..., "quizzes": [...]} file one at a time.
+
+    Files written by QuizStreamWriter (or json.dump with indent=2) have
+    each quiz between a "{" and a "}" line at four spaces of indentation,
+    so quizzes are parsed one by one without loading the whole document.
+    Other layouts are parsed whole.
+    """
+    found = False
+    lines = None
+    with open(path) as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not found:
+                found = line == '  "quizzes": ['
+            elif lines is None:
+                if line in ("  ]", "  ],"):
+                    return
+                if line == "    {":
+                    lines = [line]
+            else:
+                lines.append(line)
+                if line in ("    }", "    },"):
+                    yield json.loads("\n".join(lines).rstrip(","))
+                    lines = None
+
+    if not found:
+        with open(path) as f:
+            yield from json.load(f).get("quizzes", [])
+
+
+def recover_quizzes(path):
+    """
+    The complete quizzes an interrupted QuizStreamWriter left in path's
+    .partial file, by quiz ID ({} if there is no such file).
+    """
+    partial = partial_path(Path(path))
+    if not partial.exists():
+        return {}
+    try:
+        return {quiz["quiz_id"]: quiz for quiz in iter_streamed_quizzes(partial)}
+    except ValueError:
+        return {}  # Cut off before the first quiz
+
+
+def partial_path(path):
+    """Path of the in-progress file for a streamed JSON file."""
+    return path.with_name(path.name + ".partial")
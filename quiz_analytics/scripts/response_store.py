@@ -0,0 +1,217 @@
+"""
+Columnar on-disk store for quiz responses.
+
+all_quizzes.json nests a "responses" dict inside every submission, which is
+slow to parse and memory hungry once archives cover several semesters. The
+response store keeps the same data for a section as flat typed arrays, one
+file per column, that can be memory-mapped:
+
+    responses/
+        manifest.json   quizzes, questions and submission metadata
+        submission.bin  int32  submission index within its quiz
+        question.bin    int32  index into the quiz's question_keys
+        answer_id.bin   int64  chosen answer ID (-1 = none)
+        correct.bin     int8   1 if the response was correct
+
+Submission metadata (scores, attempts, timestamps) stays in the manifest,
+with each submission's student stored as an index into its students list.
+
+fetch_canvas_data.py writes the store next to all_quizzes.json, and
+analyze_quiz_performance.py reads it when present.
+"""
+
+import sys
+import json
+import shutil
+from array import array
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+STORE_DIR = "responses"
+FORMAT_VERSION = 1
+
+# Column name and array typecode, in file order
+COLUMNS = (
+    ("submission", "i"),
+    ("question", "i"),
+    ("answer_id", "q"),
+    ("correct", "b"),
+)
+
+NO_ANSWER_ID = -1     # answer_id was missing or null
+OTHER_ANSWER_ID = -2  # answer_id was not an integer
+
+
+def encode_answer_id(answer_id):
+    """Map a response's answer_id onto the int64 answer_id column."""
+    if isinstance(answer_id, int) and not isinstance(answer_id, bool) and answer_id >= 0:
+        return answer_id
+    return OTHER_ANSWER_ID if answer_id else NO_ANSWER_ID
+
+
+class ResponseStoreWriter:
+    """
+    Writes a section's response store one quiz at a time.
+
+    Columns are appended to files in responses.partial/, and close()
+    writes the manifest and moves the directory into place.
+    """
+
+    def __init__(self, output_dir, header):
+        self.path = Path(output_dir) / STORE_DIR
+        self.partial_path = self.path.with_name(STORE_DIR + ".partial")
+        shutil.rmtree(self.partial_path, ignore_errors=True)
+        self.partial_path.mkdir(parents=True)
+
+        self.manifest = dict(header, format=FORMAT_VERSION, byteorder=sys.byteorder,
+                             students=[], quizzes=[])
+        self._students = {}
+        self._offset = 0
+        self._files = {
+            name: open(self.partial_path / f"{name}.bin", "wb") for name, _ in COLUMNS
+        }
+
+    def write_quiz(self, quiz_data):
+        """Append one quiz (in the all_quizzes.json format)."""
+        columns = {name: array(code) for name, code in COLUMNS}
+        question_keys = {}
+        submissions = quiz_data.get("submissions", [])
+
+        for index, sub in enumerate(submissions):
+            for key, response in sub.get("responses", {}).items():
+                columns["submission"].append(index)
+                columns["question"].append(question_keys.setdefault(key, len(question_keys)))
+                columns["answer_id"].append(encode_answer_id(response.get("answer_id")))
+                columns["correct"].append(1 if response.get("correct", False) else 0)
+
+        # Submission metadata, column by column
+        fields = list(dict.fromkeys(
+            name for sub in submissions for name in sub if name != "responses"
+        ))
+        metadata = {name: [sub.get(name) for sub in submissions] for name in fields}
+        metadata["student_id"] = [
+            self._students.setdefault(sid, len(self._students)) for sid in metadata.get("student_id", [])
+        ]
+
+        entry = {k: v for k, v in quiz_data.items() if k != "submissions"}
+        entry["submissions"] = metadata
+        entry["question_keys"] = list(question_keys)
+        entry["responses"] = [self._offset, len(columns["submission"])]
+        self.manifest["quizzes"].append(entry)
+
+        for name, _ in COLUMNS:
+            columns[name].tofile(self._files[name])
+        self._offset += len(columns["submission"])
+
+    def close(self):
+        """Write the manifest and move the store into place."""
+        for f in self._files.values():
+            f.close()
+
+        self.manifest["students"] = list(self._students)
+        with open(self.partial_path / "manifest.json", "w") as f:
+            json.dump(self.manifest, f)
+
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.partial_path.rename(self.path)
+
+    def abort(self):
+        """Close the column files after a failure and delete the incomplete store."""
+        for f in self._files.values():
+            f.close()
+        shutil.rmtree(self.partial_path, ignore_errors=True)
+
+
+def read_column(path, typecode, byteorder):
+    """
+    Read one column file: memory-mapped as a NumPy array when NumPy is
+    installed (no copy), otherwise into an array.array.
+    """
+    swap = byteorder != sys.byteorder
+
+    if np is not None:
+        dtype = np.dtype(typecode)
+        if path.stat().st_size == 0:
+            return np.empty(0, dtype=dtype)
+        column = np.asarray(np.memmap(path, dtype=dtype, mode="r"))
+        return column.byteswap() if swap else column
+
+    column = array(typecode)
+    column.frombytes(path.read_bytes())
+    if swap:
+        column.byteswap()
+    return column
+
+
+def open_response_store(section_dir):
+    """
+    Open a section's response store for reading one quiz at a time.
+
+    Returns (header, quizzes), where quizzes is an iterator that builds
+    each quiz only when it is reached, or None if the section has no
+    response store. Quizzes have the same structure as in
+    load_response_store.
+    """
+    store_dir = Path(section_dir) / STORE_DIR
+    manifest_file = store_dir / "manifest.json"
+    if not manifest_file.exists():
+        return None
+
+    with open(manifest_file) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_VERSION:
+        return None
+
+    columns = {
+        name: read_column(store_dir / f"{name}.bin", code, manifest["byteorder"])
+        for name, code in COLUMNS
+    }
+    header = {k: v for k, v in manifest.items()
+              if k not in ("format", "byteorder", "students", "quizzes")}
+    return header, iter_quizzes(manifest, columns)
+
+
+def iter_quizzes(manifest, columns):
+    """Build each quiz in the manifest, with its slice of the columns."""
+    students = manifest["students"]
+
+    for entry in manifest["quizzes"]:
+        metadata = entry["submissions"]
+        count = len(next(iter(metadata.values()), []))
+        submissions = [{} for _ in range(count)]
+        for name, values in metadata.items():
+            if name == "student_id":
+                values = [students[i] for i in values]
+            for sub, value in zip(submissions, values):
+                sub[name] = value
+
+        start, length = entry["responses"]
+        quiz = {k: v for k, v in entry.items()
+                if k not in ("submissions", "question_keys", "responses")}
+        quiz["submissions"] = submissions
+        quiz["question_keys"] = entry["question_keys"]
+        quiz["response_columns"] = {
+            name: column[start:start + length] for name, column in columns.items()
+        }
+        yield quiz
+
+
+def load_response_store(section_dir):
+    """
+    Load a section's quizzes from its response store.
+
+    Returns the same structure as all_quizzes.json, except that each
+    submission has no "responses" dict: each quiz instead carries
+    "response_columns" (its slice of every column) and "question_keys".
+    Returns None if the section has no response store.
+    """
+    opened = open_response_store(section_dir)
+    if opened is None:
+        return None
+
+    header, quizzes = opened
+    return dict(header, quizzes=list(quizzes))